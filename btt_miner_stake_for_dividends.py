@@ -1,24 +1,33 @@
+from __future__ import annotations
+
 import asyncio
-from typing import Optional
+import signal
+from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 
-import bittensor as bt
-from bittensor.core.async_subtensor import AsyncSubtensor, StakeInfo
-from bittensor.utils.balance import Balance
-from bittensor.utils.btlogging import logging
-from bittensor_wallet import Wallet
+from websockets.exceptions import ConnectionClosed
+
+# bittensor is imported inside the functions that use it so importers and --help don't pay its startup cost
+if TYPE_CHECKING:
+    from bittensor.core.async_subtensor import AsyncSubtensor, StakeInfo
+    from bittensor.utils.balance import Balance
+    from bittensor_wallet import Wallet
 
 from utils.password_manager import WalletPasswordManager
+from utils import event_loop
+from utils.subtensor import ensure_subtensor, close_subtensor, submit_extrinsic
 from btt_subnet_dca import initialize_wallets
 from utils.settings import (
-    SUBTENSOR, 
     NETUID,
-    VALIDATOR_HOTKEYS,
+    VALIDATOR_HOTKEY,
     HOLDING_WALLET_NAME,
     HOLDING_WALLET_ADDRESS,
     ALPHA_RESERVE_AMOUNT
 )
 
+# Reserve in rao so transfer amounts are computed in Balance's native integer units
+ALPHA_RESERVE_RAO = round(ALPHA_RESERVE_AMOUNT * 1e9)
+
 
 """
 This script is used to secure the alpha tokens by sending them to the holding wallet.
@@ -34,68 +43,68 @@ wallet coldkey, while maintaining the same hotkey ownership.
 """
 
 
-logging.on()
-logging.set_debug(True)
-
-# extract the hotkey from the list of hotkeys and take the first one for backward compatibility
-VALIDATOR_HOTKEY = VALIDATOR_HOTKEYS[0]
+async def get_miner_stake(coldkey: str, hotkey: str, subtensor: AsyncSubtensor, block_hash: Optional[str] = None) -> Balance:  # type: ignore
+    import bittensor as bt
 
-
-async def get_miner_stake(coldkey: str, hotkey: str, subtensor: AsyncSubtensor) -> Balance:  # type: ignore
     stake: dict[int, StakeInfo] = await subtensor.get_stake_for_coldkey_and_hotkey(
         coldkey_ss58=coldkey,
         hotkey_ss58=hotkey,
         netuids=[NETUID],
+        block_hash=block_hash,
     )
     stake_alpha = stake.get(NETUID, None)
-    logging.debug(f"Stake for {hotkey}: {stake_alpha}")
-    return stake_alpha.stake if stake_alpha else Balance.from_float(0, netuid=NETUID)
+    bt.logging.debug(f"Stake for {hotkey}: {stake_alpha}")
+    return stake_alpha.stake if stake_alpha else bt.Balance.from_float(0, netuid=NETUID)
+
 
+async def get_hodl_stake_vali(subtensor: AsyncSubtensor, block_hash: Optional[str] = None) -> Balance:
+    import bittensor as bt
 
-async def get_hodl_stake_vali(subtensor: AsyncSubtensor) -> Balance:
-    stakes: list[StakeInfo] = await subtensor.get_stake_for_coldkey(HOLDING_WALLET_ADDRESS)
+    stakes: list[StakeInfo] = await subtensor.get_stake_for_coldkey(HOLDING_WALLET_ADDRESS, block_hash=block_hash)
     stake_alpha: Optional[StakeInfo] = next((stake for stake in stakes if stake.netuid == NETUID and stake.hotkey_ss58 == VALIDATOR_HOTKEY), None)
-    stake: Balance = stake_alpha.stake if stake_alpha else Balance.from_float(0, netuid=NETUID)
+    stake: Balance = stake_alpha.stake if stake_alpha else bt.Balance.from_float(0, netuid=NETUID)
     return stake
 
 
 async def transfer_stake_to_hodl(amount_alpha: Balance, wallet: Wallet, origin_hotkey: str, subtensor: AsyncSubtensor):  # type: ignore
-    return await subtensor.transfer_stake(
+    return await submit_extrinsic(subtensor, wallet.coldkeypub.ss58_address, subtensor.transfer_stake(
         wallet=wallet,
         destination_coldkey_ss58=HOLDING_WALLET_ADDRESS,
         hotkey_ss58=origin_hotkey,
         origin_netuid=NETUID,
         destination_netuid=NETUID,
         amount=amount_alpha,
-    )
+    ))
 
 
 async def delegate_stake_to_vali(amount_alpha: Balance, wallet: Wallet, origin_hotkey: str, subtensor: AsyncSubtensor) -> bool:  # type: ignore
-    return await subtensor.move_stake(
+    return await submit_extrinsic(subtensor, wallet.coldkeypub.ss58_address, subtensor.move_stake(
         wallet=wallet,
         origin_hotkey=origin_hotkey,
         origin_netuid=NETUID,
         destination_hotkey=VALIDATOR_HOTKEY,
         destination_netuid=NETUID,
         amount=amount_alpha,
-    )
+    ))
 
 
-async def send_miner_alpha_to_hodl(miner_wallet: Wallet, subtensor: AsyncSubtensor) -> bool:  # type: ignore
+async def send_miner_alpha_to_hodl(miner_wallet: Wallet, miner_coldkey: str, miner_hotkey: str, subtensor: AsyncSubtensor, alpha_amount: Optional[Balance] = None) -> bool:  # type: ignore
     """
     Move stake from the miner to the holding wallet, keeping the reserve amount if specified.
+    If alpha_amount is given it is used as the prefetched miner stake instead of querying it again.
     """
-    miner_coldkey = miner_wallet.coldkeypub.ss58_address
-    miner_hotkey = miner_wallet.hotkey.ss58_address
+    import bittensor as bt
 
-    alpha_amount: Balance = await get_miner_stake(miner_coldkey, miner_hotkey, subtensor)
+    if alpha_amount is None:
+        alpha_amount = await get_miner_stake(miner_coldkey, miner_hotkey, subtensor)
     
     # Calculate how much to transfer, respecting reserve amount
-    if float(alpha_amount) <= ALPHA_RESERVE_AMOUNT:
+    transfer_rao = alpha_amount.rao - ALPHA_RESERVE_RAO
+    if transfer_rao <= 0:
         print(f"⏭️  Current stake ({float(alpha_amount):.6f} α) is less than or equal to reserve amount ({ALPHA_RESERVE_AMOUNT:.6f} α)")
         return False
         
-    transfer_amount = Balance.from_float(float(alpha_amount) - ALPHA_RESERVE_AMOUNT, netuid=NETUID)
+    transfer_amount = bt.Balance.from_rao(transfer_rao, netuid=NETUID)
     print(f"💫 Transferring {float(transfer_amount):.6f} α, keeping {ALPHA_RESERVE_AMOUNT:.6f} α in reserve")
 
     success: bool = await transfer_stake_to_hodl(amount_alpha=transfer_amount, wallet=miner_wallet, origin_hotkey=miner_hotkey, subtensor=subtensor)
@@ -103,51 +112,77 @@ async def send_miner_alpha_to_hodl(miner_wallet: Wallet, subtensor: AsyncSubtens
     return success
 
 
-async def delegate_hodl_alpha_to_vali(miner_wallet: Wallet, hodl_wallet: Wallet, subtensor: AsyncSubtensor) -> bool:  # type: ignore
+async def delegate_hodl_alpha_to_vali(hodl_wallet: Wallet, subtensor: AsyncSubtensor, stakes: Optional[list[StakeInfo]] = None, block_hash: Optional[str] = None) -> bool:  # type: ignore
     """
     Delegate all the stake from the holding wallet to the vali hotkey.
     The stake is still bound to the original miner hotkey address so it needs to be moved to vali hotkey to accrue yield.
+    If stakes is given it is used as the holding wallet stake list instead of querying it again.
     """
-    miner_hotkey = miner_wallet.hotkey.ss58_address
+    import bittensor as bt
 
-    results: list[bool] = []
+    if stakes is None:
+        stakes = await subtensor.get_stake_for_coldkey(HOLDING_WALLET_ADDRESS, block_hash=block_hash)
 
-    stakes: list[StakeInfo] = await subtensor.get_stake_for_coldkey(HOLDING_WALLET_ADDRESS)
+    # Index the limbo stakes by origin hotkey in a single pass over the holding wallet stakes
+    by_origin: dict[str, StakeInfo] = {
+        s.hotkey_ss58: s for s in stakes if s.netuid == NETUID and s.hotkey_ss58 != VALIDATOR_HOTKEY
+    }
 
-    stakes_to_delegate: list[StakeInfo] = [s for s in stakes if s.netuid == NETUID and s.hotkey_ss58 != VALIDATOR_HOTKEY]
-
-    if len(stakes_to_delegate) > 0:
+    if by_origin:
         hodl_wallet.unlock_coldkey()
 
-    for s in stakes_to_delegate:
-        logging.debug(f"Stake on {hodl_wallet.name} that needs to be delegated to vali: {s}")
+    for s in by_origin.values():
+        bt.logging.debug(f"Stake on {hodl_wallet.name} that needs to be delegated to vali: {s}")
+
+    # Each stake moves from a distinct origin hotkey, so submit the delegations concurrently
+    results = await asyncio.gather(
+        *(
+            delegate_stake_to_vali(amount_alpha=s.stake, wallet=hodl_wallet, origin_hotkey=origin, subtensor=subtensor)
+            for origin, s in by_origin.items()
+        ),
+        return_exceptions=True,
+    )
+
+    for origin, result in zip(by_origin, results):
+        if isinstance(result, Exception):
+            bt.logging.error(f"Failed to delegate stake from {origin}: {result}")
 
-        stake_to_delegate: Balance = s.stake
+    return all(result is True for result in results)
 
-        success: bool = await delegate_stake_to_vali(amount_alpha=stake_to_delegate, wallet=hodl_wallet, origin_hotkey=miner_hotkey, subtensor=subtensor)
 
-        results.append(success)
+async def process_wallet(wallet: Wallet, coldkey: str, hotkey: str, subtensor: AsyncSubtensor, miner_stake: Optional[Balance] = None) -> bool:  # type: ignore
+    """
+    Secure the alpha of a single miner wallet by transferring it to the holding wallet.
+    """
+    cold_addr = coldkey[:5] + "..."
+    hot_addr = hotkey[:5] + "..."
+    print(f"\n🔄 Processing wallet: cold({cold_addr}) hot({hot_addr})")
+
+    # Perform stake transfer
+    success = await send_miner_alpha_to_hodl(wallet, coldkey, hotkey, subtensor, alpha_amount=miner_stake)
+    if not success:
+        print(f"❌ Failed to transfer stake to hodl wallet for cold({cold_addr}) hot({hot_addr})")
+        return False
 
-    return all(results)
+    print(f"✅ Successfully transferred stake for cold({cold_addr}) hot({hot_addr})")
+    return True
 
 
-async def secure_alpha_tokens_and_stake_to_vali():  # type: ignore
+def initialize_hodl_and_miner_wallets() -> Optional[tuple[Wallet, list[Wallet]]]:  # type: ignore
     """
-    To avoid keeping too much value on a miner key, we need to secure the alpha tokens by sending them to the holding wallet.
-    So the logic is this: Transfer the alpha tokens from miner coldkey to holding coldkey.
-    Then, to also get yield on holdings, we delegate the alpha tokens to the vali hotkey from the holding wallet.
-    This operation does not make a transaction on the alpha token's chart.
+    Unlock the holding wallet and all miner wallets (excluding the holding wallet).
+    Returns None if either could not be unlocked.
     """
+    import bittensor as bt
 
     # Initialize password manager for env and unlock wallets
     password_manager = WalletPasswordManager()
-    password_manager.load_env()
 
     # Create and unlock hodl wallet
     hodl_wallet = initialize_wallets(bt, HOLDING_WALLET_NAME)
     if not hodl_wallet:
         print("❌ No hodl wallet was successfully unlocked")
-        return
+        return None
     hodl_wallet = hodl_wallet[0]  # Take the first wallet since we only need one
 
     # Unlock all miner wallets (excluding hodl wallet)
@@ -156,73 +191,135 @@ async def secure_alpha_tokens_and_stake_to_vali():  # type: ignore
     miner_wallets = [w for w in initial_wallets if w.name != HOLDING_WALLET_NAME]
     if not miner_wallets:
         print("❌ No miner wallets found to process")
+        return None
+
+    return hodl_wallet, miner_wallets
+
+
+async def secure_alpha_tokens_and_stake_to_vali(subtensor: AsyncSubtensor, hodl_wallet: Wallet, miner_wallets: list[Wallet]):  # type: ignore
+    """
+    To avoid keeping too much value on a miner key, we need to secure the alpha tokens by sending them to the holding wallet.
+    So the logic is this: Transfer the alpha tokens from miner coldkey to holding coldkey.
+    Then, to also get yield on holdings, we delegate the alpha tokens to the vali hotkey from the holding wallet.
+    This operation does not make a transaction on the alpha token's chart.
+    """
+    import bittensor as bt
+
+    # Resolve the ss58 addresses once instead of going through the keyfiles in every helper
+    addrs = [(wallet, wallet.coldkeypub.ss58_address, wallet.hotkey.ss58_address) for wallet in miner_wallets]
+
+    # All wallets share one websocket; AsyncSubtensor multiplexes the concurrent calls
+    # Prefetch every miner stake in one concurrent batch against a pinned block
+    block_hash = await subtensor.get_block_hash()
+    miner_stakes = await asyncio.gather(
+        *(get_miner_stake(coldkey, hotkey, subtensor, block_hash=block_hash) for _, coldkey, hotkey in addrs),
+        return_exceptions=True,
+    )
+
+    # Each wallet's transfer is independent, so run them concurrently
+    results = await asyncio.gather(
+        *(
+            process_wallet(wallet, coldkey, hotkey, subtensor, miner_stake=None if isinstance(stake, Exception) else stake)
+            for (wallet, coldkey, hotkey), stake in zip(addrs, miner_stakes)
+        ),
+        return_exceptions=True,
+    )
+
+    for wallet, result in zip(miner_wallets, results):
+        if isinstance(result, Exception):
+            bt.logging.error(f"Error processing wallet {wallet.name}: {str(result)}")
+            print(f"❌ Error processing wallet {wallet.name}: {result}")
+
+    if not any(result is True for result in results):
+        return
+
+    # Delegate everything that landed in the holding wallet with a single stakes read
+    holding_stakes: list[StakeInfo] = await subtensor.get_stake_for_coldkey(HOLDING_WALLET_ADDRESS)
+    success = await delegate_hodl_alpha_to_vali(hodl_wallet, subtensor, stakes=holding_stakes)
+    if not success:
+        print("❌ Failed to delegate stake to validator")
         return
-    
-    for wallet in miner_wallets:
-        cold_addr = wallet.coldkeypub.ss58_address[:5] + "..."
-        hot_addr = wallet.hotkey.ss58_address[:5] + "..."
-        print(f"\n🔄 Processing wallet: cold({cold_addr}) hot({hot_addr})")
-
-        async with bt.AsyncSubtensor(SUBTENSOR) as subtensor:
-
-            # Perform stake transfer
-            success = await send_miner_alpha_to_hodl(wallet, subtensor)
-            if not success:
-                print("❌ Failed to transfer stake to hodl wallet")
-                continue
-
-            # Delegate to validator
-            success = await delegate_hodl_alpha_to_vali(wallet, hodl_wallet, subtensor)
-            if not success:
-                print("❌ Failed to delegate stake to validator")
-                continue
-
-            print("✅ Successfully processed wallet")
-            
-        await subtensor.close()
-        
-        # uncomment to execute one wallet (for testing)
-        #break
+
+    print("✅ Successfully delegated holding wallet stake to validator")
+
+
+async def wait_or_stop(stop: asyncio.Event, seconds: float) -> bool:
+    """
+    Sleep for the given number of seconds, waking early if stop is set.
+    Returns True if the wait was interrupted by stop.
+    """
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=seconds)
+    except asyncio.TimeoutError:
+        pass
+    return stop.is_set()
 
 
 async def run_perpetually():  # type: ignore
     """
     Runs the secure_alpha_tokens_and_stake_to_vali function perpetually with a wait period between executions.
     This function will continue indefinitely, checking for alpha tokens that need to be secured and staked.
+    Wallets are unlocked once and a single AsyncSubtensor is kept for the life of the process.
+    SIGINT/SIGTERM interrupt the wait between runs and let the loop exit cleanly.
     """
+    import bittensor as bt
+
     # Default wait time between executions (6 hours in seconds)
     WAIT_TIME_SECONDS = 6 * 60 * 60
+
+    wallets = initialize_hodl_and_miner_wallets()
+    if wallets is None:
+        return
+    hodl_wallet, miner_wallets = wallets
+
+    # Wake the long waits below on shutdown signals instead of exiting from inside the event loop
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def request_stop():
+        print("\n👋 Gracefully shutting down...")
+        stop.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, request_stop)
+
+    subtensor: Optional[AsyncSubtensor] = None
+    # Coldkeys the transfers and delegations are submitted from
+    coldkeys = list(dict.fromkeys(wallet.coldkeypub.ss58_address for wallet in [hodl_wallet, *miner_wallets]))
     
-    while True:
+    while not stop.is_set():
         try:
+            # (Re)connect when there is no live connection or the current one fails its health check
+            subtensor = await ensure_subtensor(bt, subtensor, accounts=coldkeys)
+
             print(f"🔄 Starting alpha token security and staking process at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            await secure_alpha_tokens_and_stake_to_vali()
+            await secure_alpha_tokens_and_stake_to_vali(subtensor, hodl_wallet, miner_wallets)
             print(f"✅ Completed process at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"⏱️ Waiting for {WAIT_TIME_SECONDS//3600} hours before next execution...")
-            await asyncio.sleep(WAIT_TIME_SECONDS)
+            await wait_or_stop(stop, WAIT_TIME_SECONDS)
         except Exception as e:
-            logging.error(f"Error in perpetual execution: {str(e)}")
+            bt.logging.error(f"Error in perpetual execution: {str(e)}")
             print(f"⚠️ Error occurred: {str(e)}")
+
+            # Drop the connection on websocket errors so the next attempt reconnects
+            if isinstance(e, (OSError, asyncio.TimeoutError, ConnectionClosed)) and subtensor is not None:
+                await close_subtensor(subtensor)
+                subtensor = None
+
             print(f"⏱️ Waiting for 30 minutes before retry...")
-            await asyncio.sleep(30 * 60)  # Wait 30 minutes before retrying after an error
+            await wait_or_stop(stop, 30 * 60)  # Wait 30 minutes before retrying after an error
+
+    if subtensor is not None:
+        await close_subtensor(subtensor)
 
 
 if __name__ == "__main__":
-    # Import datetime for logging timestamps in the perpetual execution
-    from datetime import datetime
-    
-    # Set up signal handlers for graceful shutdown
-    import signal
-    import sys
-    
-    def signal_handler(sig, frame):
-        print("\n👋 Gracefully shutting down...")
-        sys.exit(0)
-        
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    import bittensor as bt
+
+    bt.logging.on()
+    bt.logging.set_debug(True)
+
+    # SIGINT/SIGTERM are handled inside run_perpetually so they can wake the wait between runs
 
-    args = None
-    
     # Run the script perpetually
-    asyncio.run(run_perpetually())
+    event_loop.run(run_perpetually())
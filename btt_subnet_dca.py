@@ -1,16 +1,32 @@
 import asyncio
+import copy
 import sys
 import os
+import math
+import time
 import argparse
+from collections import deque
+from operator import attrgetter
+from typing import Any, NamedTuple
 from datetime import datetime, timedelta, timezone
 import getpass
 from utils.database import SubnetDCADatabase
 from reports import SubnetDCAReports
 from utils.password_manager import WalletPasswordManager
-from utils.settings import SUBTENSOR, BLOCK_TIME_SECONDS, DCA_RESERVE_ALPHA, DCA_RESERVE_TAO, SLIPPAGE_PRECISION, HOLDING_WALLET_NAME, VALIDATOR_HOTKEYS, VALIDATOR_HOTKEY, MIN_UNSTAKE_ALPHA, MIN_TAO_DEFICIT
+from utils import event_loop
+from utils.subtensor import ensure_subtensor, close_subtensor, submit_extrinsic, query_stakes_and_balances, BlockWatcher
+from utils.settings import SUBTENSOR, BLOCK_TIME_SECONDS, SUBNET_INFO_REFRESH_BLOCKS, WALLET_CONCURRENCY, RPC_CONCURRENCY, DCA_RESERVE_ALPHA, DCA_RESERVE_TAO, SLIPPAGE_PRECISION, HOLDING_WALLET_NAME, VALIDATOR_HOTKEYS, VALIDATOR_HOTKEY, MIN_UNSTAKE_ALPHA, MIN_TAO_DEFICIT
 import signal
 
 
+# Arguments required for each (--rotate-all-wallets, --harvest-alpha) combination, with the error shown if any is missing
+REQUIRED_ARGUMENTS = {
+    (True, False): (('netuid', 'slippage', 'budget'), "--netuid, --slippage, and --budget are required"),
+    (True, True): (('netuid', 'slippage'), "--netuid and --slippage are required with --harvest-alpha"),
+    (False, True): (('netuid', 'wallet', 'slippage'), "--netuid, --wallet, and --slippage are required with --harvest-alpha"),
+    (False, False): (('netuid', 'wallet', 'hotkey', 'slippage', 'budget'), "--netuid, --wallet, --hotkey, --slippage, and --budget are required when not using --rotate-all-wallets or --harvest-alpha"),
+}
+
 def parse_arguments():
     parser = argparse.ArgumentParser(
         description='''
@@ -82,6 +98,18 @@ This script will chase the EMA of the price of TAO and:
         action='store_true',
         help='🧪 Run in test mode without making actual transactions (recommended for first run)'
     )
+    # The detailed and silenced status views can't both apply
+    status_view = parser.add_mutually_exclusive_group()
+    status_view.add_argument(
+        '--verbose',
+        action='store_true',
+        help='🔎 Show the detailed subnet information view at the start of each cycle'
+    )
+    status_view.add_argument(
+        '--quiet',
+        action='store_true',
+        help='🤫 Skip the per-block subnet status view'
+    )
     parser.add_argument(
         '--wallet-password',
         type=str,
@@ -127,21 +155,14 @@ This script will chase the EMA of the price of TAO and:
     args = parser.parse_args()
 
     # Validate arguments based on mode
-    if args.rotate_all_wallets:
-        if args.wallet or args.hotkey:
-            parser.error("--wallet and --hotkey should not be used with --rotate-all-wallets")
-        if not args.harvest_alpha and not all([args.netuid, args.slippage, args.budget is not None]):
-            parser.error("--netuid, --slippage, and --budget are required")
-        elif args.harvest_alpha and not all([args.netuid, args.slippage]):
-            parser.error("--netuid and --slippage are required with --harvest-alpha")
-    else:
-        if args.harvest_alpha:
-            if not all([args.netuid, args.wallet, args.slippage]):
-                parser.error("--netuid, --wallet, and --slippage are required with --harvest-alpha")
-            # --hotkey is optional with --harvest-alpha when --wallet is provided
-            # If --hotkey is provided, only that specific hotkey will be processed
-        elif not all([args.netuid, args.wallet, args.hotkey, args.slippage, args.budget is not None]):
-            parser.error("--netuid, --wallet, --hotkey, --slippage, and --budget are required when not using --rotate-all-wallets or --harvest-alpha")
+    if args.rotate_all_wallets and (args.wallet or args.hotkey):
+        parser.error("--wallet and --hotkey should not be used with --rotate-all-wallets")
+    # --hotkey is optional with --harvest-alpha when --wallet is provided
+    # If --hotkey is provided, only that specific hotkey will be processed
+    required, message = REQUIRED_ARGUMENTS[(args.rotate_all_wallets, args.harvest_alpha)]
+    # A budget of 0 means no budget, so only an unset budget counts as missing
+    if any(getattr(args, name) is None if name == 'budget' else not getattr(args, name) for name in required):
+        parser.error(message)
     
     # Validate dynamic slippage arguments
     if args.dynamic_slippage:
@@ -150,26 +171,53 @@ This script will chase the EMA of the price of TAO and:
     
     return args
 
+# Last wallet scan with the directory mtimes it was built from
+wallet_groups_cache = {}
+
+def get_wallet_dir_mtimes(wallet_path, wallets):
+    """Modification times of the wallet directory and each wallet's hotkeys directory"""
+    mtimes = [os.stat(wallet_path).st_mtime_ns]
+    for wallet in wallets:
+        for path in (os.path.join(wallet_path, wallet), os.path.join(wallet_path, wallet, 'hotkeys')):
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                mtimes.append(None)
+    return tuple(mtimes)
+
 def get_wallet_groups():
-    """Group hotkeys by their coldkey (wallet) and return organized structure"""
+    """Group hotkeys by their coldkey (wallet) and return organized structure.
+
+    The scan is reused while none of the wallet or hotkeys directories have changed.
+    """
+    global wallet_groups_cache
     wallet_path = os.path.expanduser('~/.bittensor/wallets/')
     wallet_groups = {}
     
     if not os.path.exists(wallet_path):
         print("❌ No Bittensor wallet directory found")
         return wallet_groups
+
+    if wallet_groups_cache and get_wallet_dir_mtimes(wallet_path, wallet_groups_cache['wallets']) == wallet_groups_cache['mtimes']:
+        return wallet_groups_cache['groups']
     
-    wallets = sorted([d for d in os.listdir(wallet_path) 
-                     if os.path.isdir(os.path.join(wallet_path, d))])
+    # scandir entries carry their file type, so no extra stat per entry
+    with os.scandir(wallet_path) as entries:
+        wallets = sorted(entry.name for entry in entries if entry.is_dir())
+    # Taken before reading the hotkeys so a change during the scan invalidates the cache
+    mtimes = get_wallet_dir_mtimes(wallet_path, wallets)
     
     for wallet in wallets:
         hotkey_path = os.path.join(wallet_path, wallet, 'hotkeys')
-        if os.path.exists(hotkey_path):
-            hotkeys = sorted([f for f in os.listdir(hotkey_path) 
-                            if os.path.isfile(os.path.join(hotkey_path, f))])
-            if hotkeys:  # Only add wallets that have hotkeys
-                wallet_groups[wallet] = hotkeys
-    
+        try:
+            with os.scandir(hotkey_path) as entries:
+                hotkeys = sorted(entry.name for entry in entries if entry.is_file())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        if hotkeys:  # Only add wallets that have hotkeys
+            wallet_groups[wallet] = hotkeys
+
+    wallet_groups_cache = {'wallets': wallets, 'mtimes': mtimes, 'groups': wallet_groups}
     return wallet_groups
 
 def initialize_wallets(bt, wallet_name: str = None, hotkey_name: str = None, args: argparse.Namespace = None):
@@ -235,10 +283,12 @@ def initialize_wallets(bt, wallet_name: str = None, hotkey_name: str = None, arg
         # Try to unlock the coldkey
         try:            
             # Now use this password for all hotkeys of this coldkey
-            for hotkey in hotkeys:
+            wallets = [bt.wallet(name=coldkey_name, hotkey=hotkey) for hotkey in hotkeys]
+            # The hotkeys share one coldkey file, so the password only has to be stored once
+            wallets[0].coldkey_file.save_password_to_env(password)
+
+            for hotkey, wallet in zip(hotkeys, wallets):
                 try:
-                    wallet = bt.wallet(name=coldkey_name, hotkey=hotkey)
-                    wallet.coldkey_file.save_password_to_env(password)
                     wallet.unlock_coldkey()
                     unlocked_wallets.append(wallet)
                     print(f"  ✓ Added hotkey: {hotkey}")
@@ -261,19 +311,52 @@ def initialize_wallets(bt, wallet_name: str = None, hotkey_name: str = None, arg
     print(f"\n✨ Successfully initialized {len(unlocked_wallets)} wallet/hotkey pairs")
     return unlocked_wallets
 
-async def rotate_wallets(netuid, unlocked_wallets):
-    """Continuously rotate through all unlocked wallets"""
-    while True:
-        if not unlocked_wallets:
-            print("❌ No wallets available for rotation")
-            return
+# (coldkey ss58, hotkey ss58) per (wallet name, hotkey name); the wallet properties go through the keyfiles
+wallet_address_cache = {}
+
+def get_wallet_addresses(wallet):
+    """Return the (coldkey, hotkey) ss58 addresses of a wallet, resolving them once"""
+    key = (wallet.name, wallet.hotkey_str)
+    addresses = wallet_address_cache.get(key)
+    if addresses is None:
+        addresses = (wallet.coldkeypub.ss58_address, wallet.hotkey.ss58_address)
+        wallet_address_cache[key] = addresses
+    return addresses
+
+# Short "cold(...) hot(...)" labels used in status lines, by (wallet name, hotkey name)
+wallet_label_cache = {}
+
+# Abbreviated validator hotkeys for the same lines; the hotkeys are fixed by the settings
+VALIDATOR_LABELS = {hotkey: hotkey[:5] + "..." for hotkey in VALIDATOR_HOTKEYS}
 
-        for wallet in unlocked_wallets:
-            cold_addr = wallet.coldkeypub.ss58_address[:5] + "..."
-            hot_addr = wallet.hotkey.ss58_address[:5] + "..."
-            print(f"\n🔄 Switching to wallet: cold({cold_addr}) hot({hot_addr})")
+def get_wallet_label(wallet):
+    """Return the abbreviated coldkey/hotkey label of a wallet for log lines"""
+    key = (wallet.name, wallet.hotkey_str)
+    label = wallet_label_cache.get(key)
+    if label is None:
+        coldkey_ss58, hotkey_ss58 = get_wallet_addresses(wallet)
+        label = f"cold({coldkey_ss58[:5]}...) hot({hotkey_ss58[:5]}...)"
+        wallet_label_cache[key] = label
+    return label
+
+async def rotate_wallets(netuid, unlocked_wallets, sub, block_watcher):
+    """Rotate once through all unlocked wallets"""
+    if not unlocked_wallets:
+        print("❌ No wallets available for rotation")
+        return
+
+    # Wallets wait on blocks and RPCs concurrently, but take turns sizing and sending trades
+    # so each one prices against the pool the previous trade left behind
+    semaphore = asyncio.Semaphore(max(1, WALLET_CONCURRENCY))
+    trade_lock = asyncio.Lock()
+
+    async def run_wallet(wallet):
+        async with semaphore:
+            print(f"\n🔄 Switching to wallet: {get_wallet_label(wallet)}")
             # Run one complete cycle of the EMA chasing for this wallet
-            await chase_ema(netuid, wallet)
+            await chase_ema(netuid, wallet, sub, block_watcher, trade_lock)
+
+    await asyncio.gather(*(run_wallet(wallet) for wallet in unlocked_wallets))
 
 
 
@@ -282,9 +365,10 @@ def log_operation(db, wallet, operation: str, amount_tao: float, amount_alpha: f
                  error_msg: str = None, test_mode: bool = False):
     """Helper function to log all operations to database"""
     try:
+        coldkey_ss58, hotkey_ss58 = get_wallet_addresses(wallet)
         db.log_transaction(
-            coldkey=wallet.coldkeypub.ss58_address,
-            hotkey=wallet.hotkey.ss58_address,
+            coldkey=coldkey_ss58,
+            hotkey=hotkey_ss58,
             operation=operation,
             amount_tao=amount_tao,
             amount_alpha=amount_alpha,
@@ -298,22 +382,313 @@ def log_operation(db, wallet, operation: str, amount_tao: float, amount_alpha: f
     except Exception as e:
         print(f"❌ Error logging transaction: {e}")
 
-async def perform_stake(sub, wallet, netuid, increment, alpha_price, moving_price, subnet_info, test_mode=False):
+# Shared by every wallet task so concurrent wallets can't flood the node with reads;
+# created on first use so it binds to the running event loop
+rpc_semaphore = None
+
+async def rpc(call):
+    """Await a chain read once fewer than RPC_CONCURRENCY reads are in flight"""
+    global rpc_semaphore
+    if rpc_semaphore is None:
+        rpc_semaphore = asyncio.Semaphore(max(1, RPC_CONCURRENCY))
+    async with rpc_semaphore:
+        return await call
+
+async def ready(value):
+    """Return an already known value, so it can stand in for a read inside asyncio.gather"""
+    return value
+
+def print_lines(lines):
+    """Write a block of status lines to stdout in a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+# Compact per-block status view; the layout is fixed so only the values are formatted each tick
+STATUS_UPDATE_TEMPLATE = "\n".join([
+    "\n📊 Status Update",
+    "-" * 40,
+    f"{'Last Step':20}: {{last_step}}",
+    f"{'Blocks Since Last Step':20}: {{blocks_since_last_step}}",
+    f"{'Volume (α)':20}: {{volume_alpha:.2f}}",
+    f"{'Volume (τ)':20}: {{volume_tao:.2f}}",
+    f"{'Price (τ)':20}: {{price:.5f}}",
+    f"{'EMA (τ)':20}: {{ema:.5f}}",
+    f"{'Diff':20}: {{diff:.2%}}",
+    "-" * 40,
+])
+
+
+def positive_quadratic_root(b: float, c: float) -> float:
+    """Return the positive root of x^2 + b*x - c = 0 for c >= 0"""
+    root = math.sqrt(b * b + 4 * c)
+    # Use the form of the positive root that avoids cancellation
+    return (root - b) / 2 if b <= 0 else 2 * c / (root + b)
+
+
+def solve_stake_increment(subnet_info, target_slippage: float) -> float:
+    """Solve the pool curve for the TAO amount whose staking slippage equals target_slippage.
+
+    Staking x TAO into reserves (tao_in, alpha_in) returns alpha_in * x / (tao_in + x) α
+    against an ideal x / price, so the slippage is a quadratic in x with one positive root.
+
+    Returns:
+        float: The TAO increment (inf when the pool has no slippage), or None if the pool can't be solved
+    """
+    if not subnet_info.is_dynamic:
+        return float('inf')
+
+    tao_in = subnet_info.tao_in.tao
+    alpha_in = subnet_info.alpha_in.tao
+    price = subnet_info.price.tao
+    if tao_in <= 0 or alpha_in <= 0 or price <= 0:
+        return None
+
+    # x^2 + b*x - c = 0
+    # tao_in and price * alpha_in nearly cancel in b, so this needs float64 (fp32 keeps ~7 digits of a ~1e6 TAO reserve)
+    b = tao_in - price * alpha_in - price * target_slippage
+    c = price * target_slippage * tao_in
+    return positive_quadratic_root(b, c)
+
+def solve_unstake_alpha(subnet_info, target_slippage: float) -> float:
+    """Solve the pool curve for the alpha amount whose unstaking slippage equals target_slippage.
+
+    Unstaking x α from reserves (tao_in, alpha_in) returns tao_in * x / (alpha_in + x) τ
+    against an ideal x * price, so the slippage is a quadratic in x with one positive root.
+
+    Returns:
+        float: The alpha amount (inf when the pool has no slippage), or None if the pool can't be solved
+    """
+    if not subnet_info.is_dynamic:
+        return float('inf')
+
+    tao_in = subnet_info.tao_in.tao
+    alpha_in = subnet_info.alpha_in.tao
+    price = subnet_info.price.tao
+    if tao_in <= 0 or alpha_in <= 0 or price <= 0:
+        return None
+
+    # x^2 + b*x - c = 0
+    # As for staking, alpha_in and tao_in / price nearly cancel in b, so keep this in float64
+    b = alpha_in - (tao_in + target_slippage) / price
+    c = target_slippage * alpha_in / price
+    return positive_quadratic_root(b, c)
+
+def stake_slippage_rao(subnet_info):
+    """Return a function giving the slippage in rao of staking a TAO amount in rao into the pool.
+
+    Mirrors DynamicInfo.tao_to_alpha_with_slippage's rao rounding with the reserves read once,
+    so the search loops don't build Balance objects for every probe. Rao amounts are divided
+    by the int 10**9 like Balance.tao, which stays exact above 2**53 rao where / 1e9 would not.
+    k is the exact product of both reserves in rao (~1e33), far past int64, so this has to stay
+    in Python ints; a JIT-compiled int64/float64 loop could not reproduce the pool's rounding.
+    """
+    if not subnet_info.is_dynamic:
+        return lambda tao_rao: 0
+
+    tao_in_rao = subnet_info.tao_in.rao
+    alpha_in_rao = subnet_info.alpha_in.rao
+    k = subnet_info.k
+    price = subnet_info.price.tao
+
+    def slippage(tao_rao):
+        new_tao_in_rao = tao_in_rao + tao_rao
+        if new_tao_in_rao == 0:
+            return 0
+        alpha_returned_rao = alpha_in_rao - int(k / new_tao_in_rao)
+        alpha_ideal_rao = int(tao_rao / 10**9 / price * 1e9) if price != 0 else 0
+        if alpha_ideal_rao > alpha_returned_rao:
+            return int((alpha_ideal_rao / 10**9 - alpha_returned_rao / 10**9) * 1e9)
+        return 0
+
+    return slippage
+
+def unstake_conversion_rao(subnet_info):
+    """Return a function giving (TAO returned, slippage) in rao for unstaking an alpha amount in rao.
+
+    Mirrors DynamicInfo.alpha_to_tao_with_slippage the same way stake_slippage_rao does for staking.
+    """
+    if not subnet_info.is_dynamic:
+        return lambda alpha_rao: (alpha_rao, 0)
+
+    tao_in_rao = subnet_info.tao_in.rao
+    alpha_in_rao = subnet_info.alpha_in.rao
+    k = subnet_info.k
+    price = subnet_info.price.tao
+
+    def conversion(alpha_rao):
+        tao_returned_rao = tao_in_rao - int(k / (alpha_in_rao + alpha_rao))
+        tao_ideal_rao = int(alpha_rao / 10**9 * price * 1e9)
+        if tao_ideal_rao > tao_returned_rao:
+            return tao_returned_rao, int((tao_ideal_rao / 10**9 - tao_returned_rao / 10**9) * 1e9)
+        return tao_returned_rao, 0
+
+    return conversion
+
+def search_slippage(slippage_rao_at, target_rao: int, high: int, tolerance_rao: int, seed: int = None):
+    """Search (0, high] for the amount in rao whose slippage in rao is closest to target_rao.
+
+    Slippage on a constant-product pool grows roughly with the square of the amount, so its square
+    root is close to linear: probes interpolate on it (through the origin until the bracket has an
+    upper slippage) and fall back to bisection whenever a probe fails to halve the bracket. When
+    the curve points past high, high itself is probed so an out-of-range target ends at once.
+    Amounts are whole rao like the Balance they end up in, so the bracket closes exactly.
+
+    Args:
+        slippage_rao_at: Function giving the slippage in rao for an amount in rao
+        target_rao: Target slippage in rao
+        high: Upper bound of the amount in rao
+        tolerance_rao: Stop once a probe is within this many rao of the target
+        seed: Optional first probe in rao, e.g. an earlier solution
+
+    Returns:
+        tuple: (best amount in rao, its slippage in rao, first 3 and last 3 (amount_rao, slippage_rao) probes,
+            with None standing in for any skipped between them)
+    """
+    # Slippage is rounded to whole rao, so asking for less than 1 rao only runs the bracket down
+    tolerance_rao = max(tolerance_rao, 1)
+    low, low_root, high_root = 0, 0.0, None
+    target_root = math.sqrt(target_rao)
+    best, best_rao, best_diff = 0, 0, math.inf
+    bisect = False
+    # Only the first and last few probes are ever printed
+    head, tail, count = [], deque(maxlen=3), 0
+
+    while high - low > 1:
+        if seed is not None and low < seed < high:
+            amount, seed = seed, None
+        elif bisect:
+            amount = (low + high) // 2
+        elif high_root is not None and high_root > low_root:
+            amount = low + int((target_root - low_root) * (high - low) / (high_root - low_root))
+        elif low_root > 0:
+            amount = min(int(low * target_root / low_root), high)
+        else:
+            amount = (low + high) // 2
+        if not low < amount <= high or (amount == high and high_root is not None):
+            amount = (low + high) // 2
+
+        width = high - low
+        slippage_rao = slippage_rao_at(amount)
+        if count < 3:
+            head.append((amount, slippage_rao))
+        else:
+            tail.append((amount, slippage_rao))
+        count += 1
+
+        # One signed difference serves the best-so-far, tolerance and bracket checks
+        error = slippage_rao - target_rao
+        diff = -error if error < 0 else error
+        if diff < best_diff:
+            best, best_rao, best_diff = amount, slippage_rao, diff
+        if diff <= tolerance_rao:  # Within precision
+            break
+        elif error < 0:
+            if amount == high:  # Even the largest amount stays below the target
+                break
+            low, low_root = amount, math.sqrt(slippage_rao)
+        else:
+            high, high_root = amount, math.sqrt(slippage_rao)
+        bisect = (high - low) > width / 2
+
+    return best, best_rao, head + ([None] if count > 6 else []) + list(tail)
+
+# Cached subnet snapshots by netuid: (fetched_at, subnet_info)
+subnet_info_cache = {}
+
+def get_moving_price(subnet_info) -> float:
+    """Return the subnet's on-chain price EMA in TAO per alpha"""
+    # SubnetMovingPrice is stored at a different fixed-point scale than the spot price
+    return subnet_info.moving_price * 1e11
+
+# Formatted registration times by (netuid, network_registered_at); the estimate doesn't change between blocks
+registered_time_cache = {}
+
+def get_registered_time_str(subnet_info):
+    """Estimate when the subnet was registered from its block age, formatted for display"""
+    key = (subnet_info.netuid, subnet_info.network_registered_at)
+    if key not in registered_time_cache:
+        blocks_since_registration = subnet_info.last_step + subnet_info.blocks_since_last_step - subnet_info.network_registered_at
+        seconds_since_registration = blocks_since_registration * BLOCK_TIME_SECONDS
+        registered_time = datetime.now(timezone.utc) - timedelta(seconds=seconds_since_registration)
+        registered_time_cache[key] = registered_time.strftime('%Y-%m-%d %H:%M:%S UTC')
+    return registered_time_cache[key]
+
+async def get_subnet_info(sub, netuid, full=False):
+    """Get subnet info, reusing a recent snapshot for its metadata and refreshing only the market fields.
+
+    Args:
+        sub: The AsyncSubtensor connection
+        netuid: The subnet to query
+        full: Also refresh the pool reserves, e.g. when they are needed to size a trade
+
+    Returns:
+        tuple: (subnet_info, is_full) where is_full tells whether the pool reserves are current.
+            Refreshed snapshots are copies, so concurrent callers never see each other's updates.
+    """
+    cached = subnet_info_cache.get(netuid)
+    max_age = SUBNET_INFO_REFRESH_BLOCKS * BLOCK_TIME_SECONDS
+    if cached is None or time.monotonic() - cached[0] >= max_age:
+        subnet_info = await rpc(sub.subnet(netuid))
+        if subnet_info is not None:
+            subnet_info_cache[netuid] = (time.monotonic(), subnet_info)
+        return subnet_info, True
+
+    from bittensor.utils.balance import Balance, fixed_to_float
+
+    # Name, owner, identity and the like barely change, so only poll the storage items that move every block
+    subnet_info = copy.copy(cached[1])
+    queries = [
+        rpc(sub.get_subnet_price(netuid)),
+        rpc(sub.query_subtensor("SubnetMovingPrice", params=[netuid])),
+        rpc(sub.query_subtensor("SubnetVolume", params=[netuid])),
+        rpc(sub.query_subtensor("LastMechansimStepBlock", params=[netuid])),
+        rpc(sub.query_subtensor("BlocksSinceLastStep", params=[netuid])),
+        rpc(sub.query_subtensor("SubnetTaoInEmission", params=[netuid])),
+        rpc(sub.query_subtensor("SubnetAlphaOut", params=[netuid])),
+    ]
+    if full:
+        queries += [
+            rpc(sub.query_subtensor("SubnetTAO", params=[netuid])),
+            rpc(sub.query_subtensor("SubnetAlphaIn", params=[netuid])),
+        ]
+    results = await asyncio.gather(*queries)
+
+    subnet_info.price = results[0]
+    subnet_info.moving_price = fixed_to_float(results[1])
+    subnet_info.subnet_volume = Balance.from_rao(getattr(results[2], "value", results[2])).set_unit(netuid)
+    subnet_info.last_step = int(getattr(results[3], "value", results[3]))
+    subnet_info.blocks_since_last_step = int(getattr(results[4], "value", results[4]))
+    subnet_info.tao_in_emission = Balance.from_rao(getattr(results[5], "value", results[5])).set_unit(0)
+    subnet_info.alpha_out = Balance.from_rao(getattr(results[6], "value", results[6])).set_unit(netuid)
+    if full:
+        subnet_info.tao_in = Balance.from_rao(getattr(results[7], "value", results[7])).set_unit(0)
+        subnet_info.alpha_in = Balance.from_rao(getattr(results[8], "value", results[8])).set_unit(netuid)
+        subnet_info.k = subnet_info.tao_in.rao * subnet_info.alpha_in.rao
+    return subnet_info, full
+
+def invalidate_subnet_info(netuid):
+    """Drop the cached snapshot so the next read after a trade fetches the whole subnet again"""
+    subnet_info_cache.pop(netuid, None)
+
+async def perform_stake(sub, wallet, netuid, increment, alpha_price, moving_price, subnet_info, test_mode=False, slippage=None):
     """Perform stake operation with error handling and logging"""
-    slippage_info = subnet_info.slippage(increment)
-    slippage = float(slippage_info[1].tao)
+    if slippage is None:
+        slippage = float(subnet_info.slippage(increment)[1].tao)
+    coldkey_ss58, hotkey_ss58 = get_wallet_addresses(wallet)
     
     try:
         if not test_mode:
-            results = await sub.add_stake(
+            # Built fresh per trade rather than memoized: from_rao only wraps an int, and the
+            # extrinsics set_unit() the amount in place, so a shared Balance would leak its unit
+            results = await submit_extrinsic(sub, coldkey_ss58, sub.add_stake(
                 wallet=wallet,
                 netuid=netuid,
-                amount=bt.Balance.from_tao(increment),
-            )
+                amount=bt.Balance.from_rao(round(increment * 1e9)),
+            ))
             if not results:
                 raise Exception("Stake failed")
+            invalidate_subnet_info(netuid)
             
-            print(f"✅ Successfully staked {increment:.6f} TAO @ {alpha_price:.6f} to cold({wallet.coldkeypub.ss58_address[:5]}...) hot({wallet.hotkey.ss58_address[:5]}...)")
+            print(f"✅ Successfully staked {increment:.6f} TAO @ {alpha_price:.6f} to {get_wallet_label(wallet)}")
             
             log_operation(
                 db=db,
@@ -329,7 +704,7 @@ async def perform_stake(sub, wallet, netuid, increment, alpha_price, moving_pric
             )
             return True
         else:
-            print(f"🧪 TEST MODE: Would have staked {increment:.6f} TAO to cold({wallet.coldkeypub.ss58_address[:5]}...) hot({wallet.hotkey.ss58_address[:5]}...)")
+            print(f"🧪 TEST MODE: Would have staked {increment:.6f} TAO to {get_wallet_label(wallet)}")
             return True
     except Exception as e:
         log_operation(
@@ -348,45 +723,91 @@ async def perform_stake(sub, wallet, netuid, increment, alpha_price, moving_pric
         print(f"❌ Error staking: {e}")
         return False
 
-async def perform_unstake(sub, wallet, netuid, alpha_amount, total_tao_impact, alpha_price, moving_price, test_mode=False):
+async def read_wallet_stakes(sub, netuid, coldkey_ss58, hotkey_ss58, with_balance=False):
+    """Read a wallet's own and validator stakes, and optionally its balance, in one storage request.
+
+    Falls back to concurrent per-call reads if the batched read fails. As with asyncio.gather's
+    return_exceptions, a read that fails comes back as its exception.
+
+    Returns:
+        tuple: (own stake, balance or None, [stake on each of VALIDATOR_HOTKEYS])
+    """
+    hotkeys = (hotkey_ss58, *VALIDATOR_HOTKEYS)
+    try:
+        stakes, balances = await rpc(query_stakes_and_balances(
+            bt,
+            sub,
+            netuid,
+            [(coldkey_ss58, hotkey) for hotkey in hotkeys],
+            [coldkey_ss58] if with_balance else [],
+        ))
+        current_stake, *validator_stakes = [stakes[(coldkey_ss58, hotkey)] for hotkey in hotkeys]
+        return current_stake, balances.get(coldkey_ss58), validator_stakes
+    except Exception as e:
+        print(f"⚠️ Batched stake read failed ({e}), reading stakes individually...")
+
+    current_stake, balance, *validator_stakes = await asyncio.gather(
+        rpc(sub.get_stake(
+            coldkey_ss58=coldkey_ss58,
+            hotkey_ss58=hotkey_ss58,
+            netuid=netuid,
+        )),
+        rpc(sub.get_balance(coldkey_ss58)) if with_balance else ready(None),
+        *(
+            rpc(sub.get_stake(
+                coldkey_ss58=coldkey_ss58,
+                hotkey_ss58=validator_hotkey,
+                netuid=netuid,
+            ))
+            for validator_hotkey in VALIDATOR_HOTKEYS
+        ),
+        return_exceptions=True,
+    )
+    return current_stake, balance, validator_stakes
+
+async def perform_unstake(sub, wallet, netuid, alpha_amount, total_tao_impact, alpha_price, moving_price, subnet_info, test_mode=False, slippage=None):
     """Perform unstake operation with error handling and logging"""
     try:
         # Get current stake from regular hotkey
-        current_stake = await sub.get_stake(
-            coldkey_ss58=wallet.coldkeypub.ss58_address,
-            hotkey_ss58=wallet.hotkey.ss58_address,
-            netuid=netuid,
-        )
+        # Read the regular hotkey and every validator hotkey in one request
+        coldkey_ss58, hotkey_ss58 = get_wallet_addresses(wallet)
+        current_stake, _, validator_stakes = await read_wallet_stakes(sub, netuid, coldkey_ss58, hotkey_ss58)
+        if isinstance(current_stake, Exception):
+            raise current_stake
         regular_hotkey_balance = float(current_stake)
         
         # Get stake balances from all validator hotkeys
         validator_balances = []
         total_validator_balance = 0.0
+        # Per-validator results and read errors are reported together with the distribution in one write
+        lines = []
         
-        for validator_hotkey in VALIDATOR_HOTKEYS:
+        for validator_hotkey, validator_stake in zip(VALIDATOR_HOTKEYS, validator_stakes):
             try:
-                validator_stake = await sub.get_stake(
-                    coldkey_ss58=wallet.coldkeypub.ss58_address,
-                    hotkey_ss58=validator_hotkey,
-                    netuid=netuid,
-                )
+                if isinstance(validator_stake, Exception):
+                    raise validator_stake
                 validator_balance = float(validator_stake)
                 total_validator_balance += validator_balance
                 
-                validator_balances.append({
-                    'hotkey': validator_hotkey,
-                    'balance': validator_balance
-                })
+                # Only validators holding stake can contribute to the unstake
+                if validator_balance > 0:
+                    validator_balances.append({
+                        'hotkey': validator_hotkey,
+                        'balance': validator_balance
+                    })
                 
-                print(f"  • Validator hotkey {validator_hotkey[:5]}...: {validator_balance:.6f} α")
+                lines.append(f"  • Validator hotkey {VALIDATOR_LABELS[validator_hotkey]}: {validator_balance:.6f} α")
             except Exception as e:
-                print(f"  ⚠️ Error getting stake for validator {validator_hotkey[:5]}...: {e}")
+                lines.append(f"  ⚠️ Error getting stake for validator {VALIDATOR_LABELS[validator_hotkey]}: {e}")
         
-        print(f"Distribution of α:")
-        print(f"  • Regular hotkey: {regular_hotkey_balance:.6f} α")
-        print(f"  • All validator hotkeys: {total_validator_balance:.6f} α")
-        print(f"  • Total: {(regular_hotkey_balance + total_validator_balance):.6f} α")
-        print(f"  • Need to unstake: {alpha_amount:.6f} α")
+        lines += [
+            f"Distribution of α:",
+            f"  • Regular hotkey: {regular_hotkey_balance:.6f} α",
+            f"  • All validator hotkeys: {total_validator_balance:.6f} α",
+            f"  • Total: {(regular_hotkey_balance + total_validator_balance):.6f} α",
+            f"  • Need to unstake: {alpha_amount:.6f} α",
+        ]
+        print_lines(lines)
         
         # Sort validator hotkeys by balance (highest first) for efficient unstaking
         validator_balances.sort(key=lambda x: x['balance'], reverse=True)
@@ -394,9 +815,6 @@ async def perform_unstake(sub, wallet, netuid, alpha_amount, total_tao_impact, a
         remaining_unstake = alpha_amount
         total_unstaked = 0.0
         
-        # Keep track of slippage for logging
-        slippage = 0.0
-        
         if not test_mode:
             # First unstake from validator hotkeys in order of balance (highest first)
             for validator_info in validator_balances:
@@ -410,38 +828,38 @@ async def perform_unstake(sub, wallet, netuid, alpha_amount, total_tao_impact, a
                     validator_unstake = min(validator_balance, remaining_unstake)
                     
                     if validator_unstake > 0:
-                        print(f"🔄 Unstaking {validator_unstake:.6f} α from validator hotkey {validator_hotkey[:5]}...")
+                        print(f"🔄 Unstaking {validator_unstake:.6f} α from validator hotkey {VALIDATOR_LABELS[validator_hotkey]}")
                         
                         try:
-                            results = await sub.unstake(
+                            results = await submit_extrinsic(sub, coldkey_ss58, sub.unstake(
                                 wallet=wallet,
                                 hotkey_ss58=validator_hotkey,
                                 netuid=netuid,
-                                amount=bt.Balance.from_float(validator_unstake),
-                            )
+                                amount=bt.Balance.from_rao(round(validator_unstake * 1e9)),
+                            ))
                             
                             if not results:
-                                print(f"⚠️ Failed to unstake from validator hotkey {validator_hotkey[:5]}...")
+                                print(f"⚠️ Failed to unstake from validator hotkey {VALIDATOR_LABELS[validator_hotkey]}")
                             else:
                                 total_unstaked += validator_unstake
                                 remaining_unstake -= validator_unstake
-                                print(f"✅ Successfully unstaked {validator_unstake:.6f} α from validator hotkey {validator_hotkey[:5]}...")
+                                print(f"✅ Successfully unstaked {validator_unstake:.6f} α from validator hotkey {VALIDATOR_LABELS[validator_hotkey]}")
                         except Exception as e:
-                            print(f"⚠️ Error unstaking from validator hotkey {validator_hotkey[:5]}...: {e}")
+                            print(f"⚠️ Error unstaking from validator hotkey {VALIDATOR_LABELS[validator_hotkey]}: {e}")
             
             # Unstake from regular hotkey if needed
             if remaining_unstake > 0:
                 regular_unstake = min(regular_hotkey_balance, remaining_unstake)
                 
                 if regular_unstake > 0:
-                    print(f"🔄 Unstaking {regular_unstake:.6f} α from regular hotkey {wallet.hotkey.ss58_address[:5]}...")
+                    print(f"🔄 Unstaking {regular_unstake:.6f} α from regular hotkey {hotkey_ss58[:5]}...")
                     
                     try:
-                        results = await sub.unstake(
+                        results = await submit_extrinsic(sub, coldkey_ss58, sub.unstake(
                             wallet=wallet,
                             netuid=netuid,
-                            amount=bt.Balance.from_float(regular_unstake),
-                        )
+                            amount=bt.Balance.from_rao(round(regular_unstake * 1e9)),
+                        ))
                         
                         if not results:
                             print(f"⚠️ Failed to unstake from regular hotkey")
@@ -451,16 +869,20 @@ async def perform_unstake(sub, wallet, netuid, alpha_amount, total_tao_impact, a
                     except Exception as e:
                         print(f"⚠️ Error unstaking from regular hotkey: {e}")
             
+            if total_unstaked > 0:
+                invalidate_subnet_info(netuid)
+            
             # Calculate the proportion of requested amount that was actually unstaked
             proportion_unstaked = total_unstaked / alpha_amount if alpha_amount > 0 else 0
             
             # Adjust the expected tao impact proportionally
             adjusted_tao_impact = total_tao_impact * proportion_unstaked
             
-            # Get slippage from subnet info for logging
-            subnet_info = await sub.subnet(netuid)
-            tao_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=total_unstaked)
-            slippage = float(tao_conversion[1].tao)
+            # Get slippage for logging from the pool state the unstake was sized against,
+            # reusing the caller's figure when the full amount went through
+            if slippage is None or total_unstaked != alpha_amount:
+                tao_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=total_unstaked)
+                slippage = float(tao_conversion[1].tao)
             
             print(f"✅ Successfully unstaked total of {total_unstaked:.6f} α ≈ {adjusted_tao_impact:.6f} τ @ {alpha_price:.6f}")
             
@@ -494,7 +916,7 @@ async def perform_unstake(sub, wallet, netuid, alpha_amount, total_tao_impact, a
             amount_alpha=alpha_amount,
             price_tao=alpha_price,
             ema_price=moving_price,
-            slippage=slippage if 'slippage' in locals() else 0.0,
+            slippage=slippage or 0.0,
             success=False,
             error_msg=str(e),
             test_mode=test_mode
@@ -502,342 +924,475 @@ async def perform_unstake(sub, wallet, netuid, alpha_amount, total_tao_impact, a
         print(f"❌ Error during unstake: {e}")
         return False
     
-async def chase_ema(netuid, wallet):
-    """Run one cycle of EMA chasing for a wallet"""
+async def chase_ema(netuid, wallet, sub, block_watcher, trade_lock=None):
+    """Run one cycle of EMA chasing for a wallet on a shared subtensor connection.
+
+    trade_lock serializes trade sizing and submission between wallets running concurrently.
+    """
     remaining_budget = args.budget  # Initialize remaining budget
     subnet_info_displayed = False
+    last_increment = None  # Previous block's trade size, used to seed the fallback search
+    coldkey_ss58, hotkey_ss58 = get_wallet_addresses(wallet)
+    min_price_diff_gate = args.min_price_diff > 0
+    price_gated = min_price_diff_gate or args.one_way_mode is not None
+    # Dynamic slippage scales across [min_price_diff, max_price_diff], defaulting the top to 20%
+    max_price_diff = args.max_price_diff if args.max_price_diff is not None else 0.20
+    price_diff_range = max_price_diff - args.min_price_diff
+    held_lock = None
+
+    def release_trade_lock():
+        """Let the next wallet trade; called before any block wait so a skip never stalls the others"""
+        nonlocal held_lock
+        if held_lock is not None:
+            held_lock.release()
+            held_lock = None
     
-    try:
-        async with bt.AsyncSubtensor(SUBTENSOR) as sub:
+    while True:
+        # The head this pass reads; waits below return at once if a newer block landed in the meantime
+        seen_block = block_watcher.block_number
+        try:
+            if price_gated:
+                # Most blocks are skipped on price alone, so only read balances once the gates pass
+                subnet_info, subnet_info_full = await get_subnet_info(sub, netuid)
+            else:
+                # Subnet info and balances are independent reads, so pipeline them on the one websocket
+                subnet_result, current_stake, balance = await asyncio.gather(
+                    get_subnet_info(sub, netuid),
+                    rpc(sub.get_stake(
+                        coldkey_ss58 = coldkey_ss58,
+                        hotkey_ss58 = hotkey_ss58,
+                        netuid = netuid,
+                    )),
+                    rpc(sub.get_balance(coldkey_ss58)),
+                    return_exceptions=True,
+                )
+                if isinstance(subnet_result, Exception):
+                    raise subnet_result
+                subnet_info, subnet_info_full = subnet_result
 
-            while True:
-                try:
-                    subnet_info = await sub.subnet(netuid)
-                    
-                    # Get current balances with error handling
-                    try:
-                        current_stake = await sub.get_stake(
-                            coldkey_ss58 = wallet.coldkeypub.ss58_address,
-                            hotkey_ss58 = wallet.hotkey.ss58_address,
+            alpha_price = float(subnet_info.price.tao)
+            moving_price = get_moving_price(subnet_info)
+
+            # A freshly registered subnet has no EMA to chase yet
+            if moving_price <= 0:
+                print("\n⏳ Subnet has no price EMA yet, waiting...")
+                await block_watcher.wait_for_block(seen_block)
+                break
+
+            # Calculate what percentage the current price is of the EMA
+            price_diff_pct = (alpha_price / moving_price) - 1.0
+
+            # Skip if price difference is less than minimum required (never true at the default of 0)
+            if min_price_diff_gate and abs(price_diff_pct) < args.min_price_diff:
+                print_lines([
+                    f"\n⏳ Price difference ({price_diff_pct:.2%}) < minimum required ({args.min_price_diff:.2%})",
+                    "💤 Waiting for larger price movement...",
+                ])
+                await block_watcher.wait_for_block(seen_block)
+                break
+
+            # Skip before refreshing the pool or sizing a trade when one-way mode blocks this direction
+            if args.one_way_mode == 'stake' and alpha_price > moving_price:
+                print("⏭️  Price above EMA but stake-only mode active. Skipping...")
+                await block_watcher.wait_for_block(seen_block)
+                break
+            if args.one_way_mode == 'unstake' and alpha_price < moving_price:
+                print("⏭️  Price below EMA but unstake-only mode active. Skipping...")
+                await block_watcher.wait_for_block(seen_block)
+                break
+
+            if price_gated:
+                current_stake, balance = await asyncio.gather(
+                    rpc(sub.get_stake(
+                        coldkey_ss58 = coldkey_ss58,
+                        hotkey_ss58 = hotkey_ss58,
+                        netuid = netuid,
+                    )),
+                    rpc(sub.get_balance(coldkey_ss58)),
+                    return_exceptions=True,
+                )
+
+            # Get current balances with error handling, retrying once only the reads that failed
+            if isinstance(current_stake, Exception) or isinstance(balance, Exception):
+                current_stake, balance = await asyncio.gather(
+                    rpc(sub.get_stake(
+                        coldkey_ss58 = coldkey_ss58,
+                        hotkey_ss58 = hotkey_ss58,
+                        netuid = netuid,
+                    )) if isinstance(current_stake, Exception) else ready(current_stake),
+                    rpc(sub.get_balance(coldkey_ss58)) if isinstance(balance, Exception) else ready(balance),
+                    return_exceptions=True,
+                )
+
+            if isinstance(current_stake, Exception):
+                print(f"❌ Error getting stake: {current_stake}")
+                break
+                
+            if isinstance(balance, Exception):
+                print(f"❌ Error getting balance: {balance}")
+                break
+
+            stake_alpha = float(current_stake)
+            balance_tao = float(balance)
+
+            if trade_lock is not None:
+                waited = trade_lock.locked()
+                await trade_lock.acquire()
+                held_lock = trade_lock
+                if waited:
+                    # Another wallet traded in the meantime; re-read the pool and this coldkey's balances
+                    subnet_info_full = False
+                    current_stake, balance = await asyncio.gather(
+                        rpc(sub.get_stake(
+                            coldkey_ss58 = coldkey_ss58,
+                            hotkey_ss58 = hotkey_ss58,
                             netuid = netuid,
-                        )
-                    except Exception as e:
-                        print(f"❌ Error getting stake: {e}")
-                        break
-                        
-                    try:
-                        balance = await sub.get_balance(wallet.coldkeypub.ss58_address)
-                    except Exception as e:
-                        print(f"❌ Error getting balance: {e}")
-                        break
+                        )),
+                        rpc(sub.get_balance(coldkey_ss58)),
+                    )
+                    stake_alpha = float(current_stake)
+                    balance_tao = float(balance)
 
-                    alpha_price = float(subnet_info.price.tao)
-                    moving_price = float(subnet_info.moving_price) * 1e11
-                    # Calculate what percentage the current price is of the EMA
-                    price_diff_pct = (alpha_price / moving_price) - 1.0
+            # Trading needs the current pool reserves, not just the refreshed price
+            if not subnet_info_full:
+                subnet_info, subnet_info_full = await get_subnet_info(sub, netuid, full=True)
+                alpha_price = float(subnet_info.price.tao)
+                moving_price = get_moving_price(subnet_info)
+                if moving_price <= 0:
+                    print("\n⏳ Subnet has no price EMA yet, waiting...")
+                    release_trade_lock()
+                    await block_watcher.wait_for_block(seen_block)
+                    break
+                price_diff_pct = (alpha_price / moving_price) - 1.0
+                if min_price_diff_gate and abs(price_diff_pct) < args.min_price_diff:
+                    print_lines([
+                        f"\n⏳ Price difference ({price_diff_pct:.2%}) < minimum required ({args.min_price_diff:.2%})",
+                        "💤 Waiting for larger price movement...",
+                    ])
+                    release_trade_lock()
+                    await block_watcher.wait_for_block(seen_block)
+                    break
 
-                    # Skip if price difference is less than minimum required
-                    if abs(price_diff_pct) < args.min_price_diff:
-                        print(f"\n⏳ Price difference ({price_diff_pct:.2%}) < minimum required ({args.min_price_diff:.2%})")
-                        print("💤 Waiting for larger price movement...")
-                        await sub.wait_for_block()
-                        break
+            # Show full details on first run with --verbose, compact view otherwise, nothing with --quiet
+            if args.verbose and not subnet_info_displayed:
+                subnet_info_displayed = True
+                lines = ["\n📊 Subnet Information (Detailed View)", "=" * 60]
+                
+                registered_time_str = get_registered_time_str(subnet_info)
 
-                    # Show full details on first run, compact view afterwards
-                    if not subnet_info_displayed:
-                        subnet_info_displayed = True
-                        print("\n📊 Subnet Information (Detailed View)")
-                        print("=" * 60)
-                        
-                        blocks_since_registration = subnet_info.last_step + subnet_info.blocks_since_last_step - subnet_info.network_registered_at
-                        seconds_since_registration = blocks_since_registration * BLOCK_TIME_SECONDS
-                        current_time = datetime.now(timezone.utc)
-                        registered_time = current_time - timedelta(seconds=seconds_since_registration)
-                        registered_time_str = registered_time.strftime('%Y-%m-%d %H:%M:%S UTC')
-
-                        info_dict = {
-                            '🌐 Network': [
-                                ('Netuid', subnet_info.netuid),
-                                ('Subnet', subnet_info.subnet_name),
-                                ('Symbol', subnet_info.symbol)
-                            ],
-                            '👤 Ownership': [
-                                ('Owner Hotkey', subnet_info.owner_hotkey),
-                                ('Owner Coldkey', subnet_info.owner_coldkey),
-                                ('Registered', registered_time_str)
-                            ],
-                            '⚙️ Status': [
-                                ('Is Dynamic', subnet_info.is_dynamic),
-                                ('Tempo', subnet_info.tempo),
-                                ('Last Step', subnet_info.last_step),
-                                ('Blocks Since Last Step', subnet_info.blocks_since_last_step)
-                            ],
-                            '📈 Market': [
-                                ('Subnet Volume (Alpha)', str(subnet_info.subnet_volume)),
-                                ('Subnet Volume (Tao)', str(subnet_info.subnet_volume * alpha_price)),
-                                ('Emission', f"{float(subnet_info.tao_in_emission * 1e2):.2f}%"),
-                                ('Price (Tao)', f"{float(alpha_price):.5f}"),
-                                ('Moving Price (Tao)', f"{float(moving_price):.5f}"),
-                                ('Price Difference', f"{((alpha_price - moving_price) / moving_price):.2%}")
-                            ]
-                        }
-                        
-                        for section, items in info_dict.items():
-                            print(f"\n{section}")
-                            print("-" * 60)
-                            for key, value in items:
-                                print(f"{key:25}: {value}")
-                        print("=" * 60)
-                    else:
-                        # Compact view for subsequent runs
-                        print("\n📊 Status Update")
-                        print("-" * 40)
-                        compact_info = [
-                            ('Last Step', subnet_info.last_step),
-                            ('Blocks Since Last Step', subnet_info.blocks_since_last_step),
-                            ('Volume (α)', f"{float(subnet_info.subnet_volume):.2f}"),
-                            ('Volume (τ)', f"{float(subnet_info.subnet_volume * alpha_price):.2f}"),
-                            ('Price (τ)', f"{float(alpha_price):.5f}"),
-                            ('EMA (τ)', f"{float(moving_price):.5f}"),
-                            ('Diff', f"{((alpha_price - moving_price) / moving_price):.2%}")
-                        ]
-                        for key, value in compact_info:
-                            print(f"{key:20}: {value}")
-                        print("-" * 40)
-
-                    # Check if balance is too low - only for staking scenario (when alpha price < EMA)
-                    if alpha_price < moving_price and float(balance) < DCA_RESERVE_TAO:
-                        print(f"\n⚠️  Balance ({float(balance):.6f} τ) below TAO reserve minimum ({DCA_RESERVE_TAO} τ)")
-                        print(f"    Can't stake when below minimum TAO reserve.")
-                        break
+                info_dict = {
+                    '🌐 Network': [
+                        ('Netuid', subnet_info.netuid),
+                        ('Subnet', subnet_info.subnet_name),
+                        ('Symbol', subnet_info.symbol)
+                    ],
+                    '👤 Ownership': [
+                        ('Owner Hotkey', subnet_info.owner_hotkey),
+                        ('Owner Coldkey', subnet_info.owner_coldkey),
+                        ('Registered', registered_time_str)
+                    ],
+                    '⚙️ Status': [
+                        ('Is Dynamic', subnet_info.is_dynamic),
+                        ('Tempo', subnet_info.tempo),
+                        ('Last Step', subnet_info.last_step),
+                        ('Blocks Since Last Step', subnet_info.blocks_since_last_step)
+                    ],
+                    '📈 Market': [
+                        ('Subnet Volume (Alpha)', str(subnet_info.subnet_volume)),
+                        ('Subnet Volume (Tao)', str(subnet_info.subnet_volume * alpha_price)),
+                        ('Emission', f"{float(subnet_info.tao_in_emission * 1e2):.2f}%"),
+                        ('Price (Tao)', f"{alpha_price:.5f}"),
+                        ('Moving Price (Tao)', f"{moving_price:.5f}"),
+                        ('Price Difference', f"{price_diff_pct:.2%}")
+                    ]
+                }
+                
+                for section, items in info_dict.items():
+                    lines.append(f"\n{section}")
+                    lines.append("-" * 60)
+                    for key, value in items:
+                        lines.append(f"{key:25}: {value}")
+                lines.append("=" * 60)
+                print_lines(lines)
+            elif not args.quiet:
+                # Compact view for subsequent runs
+                volume_alpha = float(subnet_info.subnet_volume)
+                print_lines([STATUS_UPDATE_TEMPLATE.format(
+                    last_step=subnet_info.last_step,
+                    blocks_since_last_step=subnet_info.blocks_since_last_step,
+                    volume_alpha=volume_alpha,
+                    volume_tao=volume_alpha * alpha_price,
+                    price=alpha_price,
+                    ema=moving_price,
+                    diff=price_diff_pct,
+                )])
 
-                    # Calculate dynamic slippage if enabled
-                    target_slippage = args.slippage
-                    if args.dynamic_slippage:
-                        # Get the maximum price difference, default to 20% if not specified
-                        max_price_diff = args.max_price_diff if args.max_price_diff is not None else 0.20
-                        
-                        # Calculate scale factor based on how close we are to min_price_diff
-                        # 1.0 = full slippage when far from EMA
-                        # 0.0 = no slippage when at min_price_diff
-                        scale_factor = min(1.0, max(0.0, 
-                            abs(price_diff_pct) - args.min_price_diff) / 
-                            (max_price_diff - args.min_price_diff) if max_price_diff > args.min_price_diff else 0.0
-                        )
-                        
-                        # Scale slippage down from base slippage as we get closer to EMA
-                        target_slippage = args.slippage * scale_factor
-                        
-                        print(f"\n📊 Dynamic Slippage Adjustment")
-                        print("-" * 40)
-                        print(f"{'Base Slippage':20}: {args.slippage:.6f}")
-                        print(f"{'Min Price Diff':20}: {args.min_price_diff:.2%}")
-                        print(f"{'Max Price Diff':20}: {max_price_diff:.2%}")
-                        print(f"{'Current Price Diff':20}: {price_diff_pct:.2%}")
-                        print(f"{'Scale Factor':20}: {scale_factor:.2f}")
-                        print(f"{'Target Slippage':20}: {target_slippage:.6f}")
-                        print("-" * 40)
-
-                    # Set max_increment based on budget or available balance
-                    if args.budget == 0:
-                        if alpha_price > moving_price:  # Unstaking
-                            # Calculate available alpha considering reserve
-                            available_alpha = float(current_stake) - DCA_RESERVE_ALPHA
-                            if available_alpha <= 0:
-                                print(f"\n⚠️  Current stake ({float(current_stake):.6f} α) is less than or equal to alpha reserve ({DCA_RESERVE_ALPHA} α)")
-                                break
-                                
-                            # Convert available alpha to TAO to get maximum available
-                            stake_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=available_alpha)
-                            max_increment = float(stake_conversion[0].tao + stake_conversion[1].tao)
-                        else:  # Staking
-                            # Account for TAO reserve when staking
-                            max_increment = float(balance) - DCA_RESERVE_TAO
-                    else:
-                        max_increment = remaining_budget
-
-                    if max_increment <= 0:
-                        if args.budget > 0:
-                            print(f"\n✨ Budget exhausted. Total used: {args.budget - remaining_budget:.6f} TAO")
-                        else:
-                            print(f"\n✨ Available balance/stake exhausted")
-                        break
+            # Check if balance is too low - only for staking scenario (when alpha price < EMA)
+            if alpha_price < moving_price and balance_tao < DCA_RESERVE_TAO:
+                print_lines([
+                    f"\n⚠️  Balance ({balance_tao:.6f} τ) below TAO reserve minimum ({DCA_RESERVE_TAO} τ)",
+                    f"    Can't stake when below minimum TAO reserve.",
+                ])
+                break
 
-                    # Rest of the binary search code remains the same
-                    min_increment = 0.0
-                    best_increment = 0.0
-                    closest_slippage = float('inf')
-                    iterations = []
-                    
-                    print("\n🔍 Finding optimal trade size...")
-                    while (max_increment - min_increment) > 1e-12:  # Even more precision
-                        current_increment = (min_increment + max_increment) / 2
-                        slippage_tuple = subnet_info.slippage(current_increment)
-                        slippage = float(slippage_tuple[1].tao)
-                        
-                        # Store iteration info
-                        iterations.append((current_increment, slippage))
-                        
-                        if abs(slippage - target_slippage) < abs(closest_slippage - target_slippage):
-                            closest_slippage = slippage
-                            best_increment = current_increment
-                        
-                        if abs(slippage - target_slippage) < 1e-12:  # Matching precision
-                            break
-                        elif slippage < target_slippage:
-                            min_increment = current_increment
-                        else:
-                            max_increment = current_increment
-
-                    # Print first 3 and last 3 iterations
-                    for i, (inc, slip) in enumerate(iterations):
-                        if i < 3 or i >= len(iterations) - 3:
-                            print(f"  • Testing {inc:.12f} TAO → {slip:.12f} slippage")
-                        elif i == 3:
-                            print("  • ...")
-
-                    increment = best_increment
-                    print(f"\n💫 Trade Parameters")
-                    print("-" * 40)
-                    print(f"{'Size':20}: {increment:.12f} TAO")
-                    print(f"{'Slippage':20}: {float(subnet_info.slippage(increment)[1].tao):.12f} TAO")
-                    if args.budget > 0:
-                        print(f"{'Budget Left':20}: {remaining_budget:.6f} TAO")
-                    else:
-                        if alpha_price > moving_price:
-                            print(f"{'Stake Available':20}: {current_stake} α")
-                        else:
-                            print(f"{'Balance Available':20}: {balance} τ")
-                    print("-" * 40)
+            # Calculate dynamic slippage if enabled
+            target_slippage = args.slippage
+            if args.dynamic_slippage:
+                # Calculate scale factor based on how close we are to min_price_diff
+                # 1.0 = full slippage when far from EMA
+                # 0.0 = no slippage when at min_price_diff
+                if price_diff_range > 0:
+                    scale_factor = min(1.0, max(0.0, abs(price_diff_pct) - args.min_price_diff) / price_diff_range)
+                else:
+                    scale_factor = 0.0
+                
+                # Scale slippage down from base slippage as we get closer to EMA
+                target_slippage = args.slippage * scale_factor
+                
+                print_lines([
+                    "\n📊 Dynamic Slippage Adjustment",
+                    "-" * 40,
+                    f"{'Base Slippage':20}: {args.slippage:.6f}",
+                    f"{'Min Price Diff':20}: {args.min_price_diff:.2%}",
+                    f"{'Max Price Diff':20}: {max_price_diff:.2%}",
+                    f"{'Current Price Diff':20}: {price_diff_pct:.2%}",
+                    f"{'Scale Factor':20}: {scale_factor:.2f}",
+                    f"{'Target Slippage':20}: {target_slippage:.6f}",
+                    "-" * 40,
+                ])
+
+            # A zero slippage budget (price at min_price_diff with dynamic slippage) only sizes a zero trade
+            if target_slippage <= 0:
+                print("\n✨ Target slippage is zero, skipping this block")
+                release_trade_lock()
+                await block_watcher.wait_for_block(seen_block)
+                break
 
-                    if args.budget > 0 and increment > remaining_budget:
-                        print("❌ Insufficient remaining budget")
+            # Set max_increment based on budget or available balance
+            available_conversion = None  # alpha_to_tao_with_slippage of all available alpha, when computed
+            if args.budget == 0:
+                if alpha_price > moving_price:  # Unstaking
+                    # Calculate available alpha considering reserve
+                    available_alpha = stake_alpha - DCA_RESERVE_ALPHA
+                    if available_alpha <= 0:
+                        print(f"\n⚠️  Current stake ({stake_alpha:.6f} α) is less than or equal to alpha reserve ({DCA_RESERVE_ALPHA} α)")
                         break
+                        
+                    # Convert available alpha to TAO to get maximum available
+                    available_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=available_alpha)
+                    max_increment = float(available_conversion[0].tao + available_conversion[1].tao)
+                else:  # Staking
+                    # Account for TAO reserve when staking
+                    max_increment = balance_tao - DCA_RESERVE_TAO
+            else:
+                max_increment = remaining_budget
 
-                    # Only decrement budget if we're using it
-                    if args.budget > 0:
-                        remaining_budget -= abs(increment)
+            if max_increment <= 0:
+                if args.budget > 0:
+                    print(f"\n✨ Budget exhausted. Total used: {args.budget - remaining_budget:.6f} TAO")
+                else:
+                    print(f"\n✨ Available balance/stake exhausted")
+                break
 
-                    if alpha_price > moving_price:
-                        if args.one_way_mode == 'stake':
-                            print("⏭️  Price above EMA but stake-only mode active. Skipping...")
-                            await sub.wait_for_block()
-                            break
-                            
-                        print(f"\n📉 Price above EMA - UNSTAKING cold({wallet.coldkeypub.ss58_address[:5]}...) hot({wallet.hotkey.ss58_address[:5]}...)")
-                        
-                        # Convert alpha amount to TAO equivalent including slippage
-                        alpha_amount = increment / alpha_price
-                        
-                        # Check if unstaking would leave less than DCA_RESERVE_ALPHA
-                        available_alpha = float(current_stake) - DCA_RESERVE_ALPHA
-                        if available_alpha <= 0:
-                            print(f"\n⚠️  Current stake ({float(current_stake):.6f} α) is less than or equal to alpha reserve ({DCA_RESERVE_ALPHA} α)")
-                            break
-                            
-                        # Adjust alpha_amount if it would leave less than DCA_RESERVE_ALPHA
-                        if alpha_amount > available_alpha:
-                            print(f"\n⚠️  Reducing unstake amount from {alpha_amount:.6f} α to {available_alpha:.6f} α to maintain alpha reserve")
-                            alpha_amount = available_alpha
-                            
-                        tao_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=alpha_amount)
-                        total_tao_impact = float(tao_conversion[0].tao + tao_conversion[1].tao)
-                        
-                        if args.budget > 0 and total_tao_impact > remaining_budget:
-                            print(f"❌ Unstaking {alpha_amount} α would result in {total_tao_impact} τ impact, exceeding budget of {remaining_budget} τ")
-                            break
+            print("\n🔍 Finding optimal trade size...")
+            best_increment = None
+            best_slippage = None
+            solved_increment = solve_stake_increment(subnet_info, target_slippage)
+            if solved_increment is not None:
+                if solved_increment >= max_increment:
+                    best_increment = max_increment
+                else:
+                    # Verify the closed-form size against the pool before trusting it
+                    solved_slippage = float(subnet_info.slippage(solved_increment)[1].tao)
+                    if abs(solved_slippage - target_slippage) <= max(1e-7, target_slippage * 1e-3):
+                        best_increment = solved_increment
+                        best_slippage = solved_slippage
+                if best_increment is not None:
+                    print(f"  • Solved {best_increment:.12f} TAO for {target_slippage:.12f} target slippage")
 
-                        success = await perform_unstake(
-                            sub=sub,
-                            wallet=wallet,
-                            netuid=netuid,
-                            alpha_amount=alpha_amount,
-                            total_tao_impact=total_tao_impact,
-                            alpha_price=alpha_price,
-                            moving_price=moving_price,
-                            test_mode=TEST_MODE
-                        )
-                        
-                        if success and args.budget > 0:
-                            remaining_budget -= total_tao_impact
-                            await asyncio.sleep(1)
-
-                    elif alpha_price < moving_price:
-                        if args.one_way_mode == 'unstake':
-                            print("⏭️  Price below EMA but unstake-only mode active. Skipping...")
-                            await sub.wait_for_block()
-                            break
-                            
-                        print(f"\n📈 Price below EMA - STAKING cold({wallet.coldkeypub.ss58_address[:5]}...) hot({wallet.hotkey.ss58_address[:5]}...)")
+            if best_increment is None:
+                # Fall back to searching the pool's slippage, comparing in integer rao
+                # Stop within SLIPPAGE_PRECISION, but never looser than the closed-form check above
+                tolerance_rao = int(min(SLIPPAGE_PRECISION, target_slippage * 1e-3) * 1e9)
+                # Probe the closed-form size that just missed verification, else the previous block's size;
+                # either is usually already close
+                seed_increment = solved_increment if solved_increment is not None else last_increment
+                best_increment_rao, best_slippage_rao, probes = search_slippage(
+                    stake_slippage_rao(subnet_info),
+                    int(target_slippage * 1e9),
+                    int(max_increment * 1e9),
+                    tolerance_rao,
+                    seed=int(seed_increment * 1e9) if seed_increment is not None else None,
+                )
+                best_increment = best_increment_rao / 1e9
+                best_slippage = best_slippage_rao / 1e9
 
-                        if args.budget > 0 and increment > remaining_budget:
-                            print("❌ Insufficient remaining budget")
-                            break
+                # Print first 3 and last 3 iterations
+                print_lines([
+                    "  • ..." if probe is None else f"  • Testing {probe[0] / 1e9:.12f} TAO → {probe[1] / 1e9:.12f} slippage"
+                    for probe in probes
+                ])
 
-                        success = await perform_stake(
-                            sub=sub,
-                            wallet=wallet,
-                            netuid=netuid,
-                            increment=increment,
-                            alpha_price=alpha_price,
-                            moving_price=moving_price,
-                            subnet_info=subnet_info,
-                            test_mode=TEST_MODE
-                        )
-                        
-                        if success and args.budget > 0:
-                            remaining_budget -= increment
-                            await asyncio.sleep(1)
-
-                    else:
-                        print("🦄 Price equals EMA - No action needed")
-                        await sub.wait_for_block()
-                        continue  # Don't decrement budget if no action taken
-
-                    current_stake = await sub.get_stake(
-                        coldkey_ss58 = wallet.coldkeypub.ss58_address,
-                        hotkey_ss58 = wallet.hotkey.ss58_address,
-                        netuid = netuid,
-                    )
+            increment = best_increment
+            last_increment = increment
+            # The search already priced the chosen size; only a budget-capped size still needs it
+            if best_slippage is None:
+                best_slippage = float(subnet_info.slippage(increment)[1].tao)
+            lines = [
+                "\n💫 Trade Parameters",
+                "-" * 40,
+                f"{'Size':20}: {increment:.12f} TAO",
+                f"{'Slippage':20}: {best_slippage:.12f} TAO",
+            ]
+            if args.budget > 0:
+                lines.append(f"{'Budget Left':20}: {remaining_budget:.6f} TAO")
+            else:
+                if alpha_price > moving_price:
+                    lines.append(f"{'Stake Available':20}: {current_stake} α")
+                else:
+                    lines.append(f"{'Balance Available':20}: {balance} τ")
+            lines.append("-" * 40)
+            print_lines(lines)
 
-                    balance = await sub.get_balance(wallet.coldkeypub.ss58_address)
-                    print(f"\n💰 Wallet Status")
-                    print("-" * 40)
-                    print(f"{'Balance':20}: {balance}τ")
-                    print(f"{'Stake':20}: {current_stake}{subnet_info.symbol}")
-                    print("-" * 40)
-
-                    # Update balances after each operation
-                    db.update_balances(
-                        coldkey=wallet.coldkeypub.ss58_address,
-                        hotkey=wallet.hotkey.ss58_address,
-                        tao_balance=float(balance),
-                        alpha_stake=float(current_stake)
-                    )
+            if args.budget > 0 and increment > remaining_budget:
+                print("❌ Insufficient remaining budget")
+                break
 
-                    # After successful operation or skip
-                    if args.rotate_all_wallets:
-                        reports.print_summary(hours_segments=[24])
-                        #reports.print_wallet_summary(wallet.coldkeypub.ss58_address)
-                        print("\n⏭️ Moving to next wallet...")
-                        await sub.wait_for_block()
-                        break
+            # Only decrement budget if we're using it
+            if args.budget > 0:
+                remaining_budget -= abs(increment)
+
+            if alpha_price > moving_price:
+                if args.one_way_mode == 'stake':
+                    print("⏭️  Price above EMA but stake-only mode active. Skipping...")
+                    release_trade_lock()
+                    await block_watcher.wait_for_block(seen_block)
+                    break
+                    
+                print(f"\n📉 Price above EMA - UNSTAKING {get_wallet_label(wallet)}")
+                
+                # Convert alpha amount to TAO equivalent including slippage
+                alpha_amount = increment / alpha_price
+                
+                # Check if unstaking would leave less than DCA_RESERVE_ALPHA
+                available_alpha = stake_alpha - DCA_RESERVE_ALPHA
+                if available_alpha <= 0:
+                    print(f"\n⚠️  Current stake ({stake_alpha:.6f} α) is less than or equal to alpha reserve ({DCA_RESERVE_ALPHA} α)")
+                    break
                     
-                    # For single wallet mode, continue to next block
-                    print("\n⏳ Waiting for next block...")
-                    await sub.wait_for_block()
+                # Adjust alpha_amount if it would leave less than DCA_RESERVE_ALPHA
+                if alpha_amount > available_alpha:
+                    print(f"\n⚠️  Reducing unstake amount from {alpha_amount:.6f} α to {available_alpha:.6f} α to maintain alpha reserve")
+                    alpha_amount = available_alpha
+                    
+                # Unstaking everything above the reserve was already priced when sizing max_increment
+                if available_conversion is not None and alpha_amount == available_alpha:
+                    tao_conversion = available_conversion
+                else:
+                    tao_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=alpha_amount)
+                total_tao_impact = float(tao_conversion[0].tao + tao_conversion[1].tao)
+                
+                if args.budget > 0 and total_tao_impact > remaining_budget:
+                    print(f"❌ Unstaking {alpha_amount} α would result in {total_tao_impact} τ impact, exceeding budget of {remaining_budget} τ")
+                    break
 
-                except Exception as e:
-                    print(f"❌ Error in main loop: {e}")
-                    print("⏳ Waiting before retry...")
-                    await asyncio.sleep(BLOCK_TIME_SECONDS)
+                success = await perform_unstake(
+                    sub=sub,
+                    wallet=wallet,
+                    netuid=netuid,
+                    alpha_amount=alpha_amount,
+                    total_tao_impact=total_tao_impact,
+                    alpha_price=alpha_price,
+                    moving_price=moving_price,
+                    subnet_info=subnet_info,
+                    test_mode=TEST_MODE,
+                    slippage=float(tao_conversion[1].tao)
+                )
+                
+                if success and args.budget > 0:
+                    remaining_budget -= total_tao_impact
+
+            elif alpha_price < moving_price:
+                if args.one_way_mode == 'unstake':
+                    print("⏭️  Price below EMA but unstake-only mode active. Skipping...")
+                    release_trade_lock()
+                    await block_watcher.wait_for_block(seen_block)
                     break
                     
-    except Exception as e:
-        print(f"❌ Error connecting to Subtensor: {e}")
-        print("⚠️ Make sure Subtensor endpoint is accessible")
-        if SUBTENSOR == 'finney':
-            print("💡 Try using ws://127.0.0.1:9944 with a local node instead")
+                print(f"\n📈 Price below EMA - STAKING {get_wallet_label(wallet)}")
+
+                if args.budget > 0 and increment > remaining_budget:
+                    print("❌ Insufficient remaining budget")
+                    break
+
+                success = await perform_stake(
+                    sub=sub,
+                    wallet=wallet,
+                    netuid=netuid,
+                    increment=increment,
+                    alpha_price=alpha_price,
+                    moving_price=moving_price,
+                    subnet_info=subnet_info,
+                    test_mode=TEST_MODE,
+                    slippage=best_slippage
+                )
+                
+                if success and args.budget > 0:
+                    remaining_budget -= increment
+
+            else:
+                print("🦄 Price equals EMA - No action needed")
+                release_trade_lock()
+                await block_watcher.wait_for_block(seen_block)
+                continue  # Don't decrement budget if no action taken
+
+            current_stake, balance = await asyncio.gather(
+                rpc(sub.get_stake(
+                    coldkey_ss58 = coldkey_ss58,
+                    hotkey_ss58 = hotkey_ss58,
+                    netuid = netuid,
+                )),
+                rpc(sub.get_balance(coldkey_ss58)),
+            )
+            print_lines([
+                f"\n💰 Wallet Status",
+                "-" * 40,
+                f"{'Balance':20}: {balance}τ",
+                f"{'Stake':20}: {current_stake}{subnet_info.symbol}",
+                "-" * 40,
+            ])
+
+            # Update balances after each operation
+            db.update_balances(
+                coldkey=coldkey_ss58,
+                hotkey=hotkey_ss58,
+                tao_balance=float(balance),
+                alpha_stake=float(current_stake)
+            )
+            release_trade_lock()
+
+            # After successful operation or skip
+            if args.rotate_all_wallets:
+                reports.print_summary(hours_segments=[24])
+                #reports.print_wallet_summary(coldkey_ss58)
+                print("\n⏭️ Moving to next wallet...")
+                await block_watcher.wait_for_block(seen_block)
+                break
+            
+            # For single wallet mode, continue to next block
+            print("\n⏳ Waiting for next block...")
+            await block_watcher.wait_for_block(seen_block)
+
+        except Exception as e:
+            print_lines([
+                f"❌ Error in main loop: {e}",
+                "⏳ Waiting before retry...",
+            ])
+            release_trade_lock()
+            await asyncio.sleep(BLOCK_TIME_SECONDS)
+            break
+        finally:
+            release_trade_lock()
 
 async def main(wallets=None, single_wallet=None):
     """Main execution function.
@@ -846,6 +1401,20 @@ async def main(wallets=None, single_wallet=None):
         wallets: List of unlocked wallet objects for rotation
         single_wallet: Single wallet object for specific operations
     """
+    # Cancel the run on SIGINT/SIGTERM so the finally blocks stop the block subscription and close the connection
+    main_task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+
+    def request_stop():
+        print("\n⚠️ Received termination signal. Cleaning up...")
+        main_task.cancel()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, request_stop)
+        except NotImplementedError:
+            pass  # Windows event loops have no signal handlers; Ctrl+C still raises KeyboardInterrupt
+
     # Apply CLI overrides for reserve values if provided
     global DCA_RESERVE_ALPHA, DCA_RESERVE_TAO
     if args.alpha_reserve is not None:
@@ -856,28 +1425,63 @@ async def main(wallets=None, single_wallet=None):
         DCA_RESERVE_TAO = args.tao_reserve
         print(f"🔄 Using CLI override for TAO reserve: {DCA_RESERVE_TAO}")
         
+    # Harvest and rotation modes get their wallets already unlocked by the __main__ block
+    if (args.harvest_alpha or args.rotate_all_wallets) and not wallets:
+        print("❌ No wallets were initialized")
+        sys.exit(1)
     if args.harvest_alpha:
         # All wallets mode or single wallet with all hotkeys mode
-        if wallets:
-            print(f"\n🔄 Starting alpha harvesting for {'all wallets' if args.rotate_all_wallets else f'all hotkeys of wallet: {args.wallet}'}")
-            while True:
-                await rotate_wallets_for_harvest(args.netuid, wallets)
-        else:
-            print("❌ No wallets were initialized")
-            sys.exit(1)
-    else:
-        # Original EMA chasing mode
-        if args.rotate_all_wallets:
-            # Initialize all wallets first
-            unlocked_wallets = initialize_wallets(bt)
-            while True:
-                await rotate_wallets(args.netuid, unlocked_wallets)
-        else:
-            # Original single wallet mode
-            while True:
-                await chase_ema(args.netuid, wallet)
+        print(f"\n🔄 Starting alpha harvesting for {'all wallets' if args.rotate_all_wallets else f'all hotkeys of wallet: {args.wallet}'}")
 
-async def harvest_alpha_for_tao_reserve(sub, wallet, netuid, target_slippage, test_mode=False):
+    # Coldkeys this run submits extrinsics from
+    trading_coldkeys = list(dict.fromkeys(
+        get_wallet_addresses(wallet)[0] for wallet in (wallets or [single_wallet]) if wallet is not None
+    ))
+
+    # Keep one connection (and its block subscription) for the whole run, reconnecting only when it goes bad
+    sub = None
+    block_watcher = None
+    try:
+        while True:
+            try:
+                # Headers still arriving prove the connection is alive, so skip the health ping
+                if block_watcher is not None and block_watcher.is_live(2 * BLOCK_TIME_SECONDS):
+                    healthy_sub = sub
+                else:
+                    healthy_sub = await ensure_subtensor(bt, sub, accounts=trading_coldkeys)
+            except Exception as e:
+                print(f"❌ Error connecting to Subtensor: {e}")
+                print("⚠️ Make sure Subtensor endpoint is accessible")
+                if SUBTENSOR == 'finney':
+                    print("💡 Try using ws://127.0.0.1:9944 with a local node instead")
+                sub = None
+                await asyncio.sleep(BLOCK_TIME_SECONDS)
+                continue
+
+            if healthy_sub is not sub:
+                if block_watcher is not None:
+                    block_watcher.stop()
+                sub = healthy_sub
+                block_watcher = BlockWatcher(sub)
+                block_watcher.start()
+            else:
+                # The connection passed its health ping, so resubscribe if only the header feed dropped
+                block_watcher.start()
+
+            if args.harvest_alpha:
+                await rotate_wallets_for_harvest(args.netuid, wallets, sub, block_watcher)
+            elif args.rotate_all_wallets:
+                await rotate_wallets(args.netuid, wallets, sub, block_watcher)
+            else:
+                # Original single wallet mode
+                await chase_ema(args.netuid, single_wallet, sub, block_watcher)
+    finally:
+        if block_watcher is not None:
+            block_watcher.stop()
+        if sub is not None:
+            await close_subtensor(sub)
+
+async def harvest_alpha_for_tao_reserve(sub, wallet, netuid, target_slippage, test_mode=False, subnet_info=None):
     """Harvest excess alpha to maintain TAO reserve and replenish up to DCA_RESERVE_TAO amount.
     
     This function:
@@ -885,82 +1489,84 @@ async def harvest_alpha_for_tao_reserve(sub, wallet, netuid, target_slippage, te
     2. If below DCA_RESERVE_TAO, calculates how much alpha to unstake
     3. Performs unstaking in increments that maintain slippage target
     
+    A subnet_info the caller already fetched for this block is used as is; otherwise it is read here.
+    
     Returns:
         tuple: (success, remaining_deficit, has_more_alpha)
             - success: Whether the operation was successful
             - remaining_deficit: How much more TAO is needed to reach DCA_RESERVE_TAO
             - has_more_alpha: Whether there's still alpha available to unstake
     """
+    # Wallets are harvested concurrently, so this wallet's report is collected and written in blocks
+    lines = [f"\n🔄 Alpha harvesting for wallet: {get_wallet_label(wallet)}"]
     try:
         # Get wallet information
-        coldkey_ss58 = wallet.coldkeypub.ss58_address
-        hotkey_ss58 = wallet.hotkey.ss58_address
-        cold_addr = coldkey_ss58[:5] + "..."
-        hot_addr = hotkey_ss58[:5] + "..."
+        coldkey_ss58, hotkey_ss58 = get_wallet_addresses(wallet)
         
-        print(f"\n🔄 Alpha harvesting for wallet: cold({cold_addr}) hot({hot_addr})")
+        # Fetch the subnet alongside one read of both balances and every validator stake
+        subnet_info, (current_stake, balance, validator_stakes) = await asyncio.gather(
+            rpc(sub.subnet(netuid)) if subnet_info is None else ready(subnet_info),
+            read_wallet_stakes(sub, netuid, coldkey_ss58, hotkey_ss58, with_balance=True),
+        )
         
         # Get subnet info for price information
-        subnet_info = await sub.subnet(netuid)
         alpha_price = float(subnet_info.price.tao)
-        moving_price = float(subnet_info.moving_price) * 1e11
+        moving_price = get_moving_price(subnet_info)
         
         # Get current balances
         try:
             # Get stake balance (alpha)
-            current_stake = await sub.get_stake(
-                coldkey_ss58=coldkey_ss58,
-                hotkey_ss58=hotkey_ss58,
-                netuid=netuid,
-            )
+            if isinstance(current_stake, Exception):
+                raise current_stake
             alpha_balance = float(current_stake)
 
             # Get stake balance on validator hotkeys
             total_validator_alpha = 0.0
             
-            for validator_hotkey in VALIDATOR_HOTKEYS:
-                try:
-                    validator_stake = await sub.get_stake(
-                        coldkey_ss58=coldkey_ss58,
-                        hotkey_ss58=validator_hotkey,
-                        netuid=netuid,
-                    )
-                    validator_alpha_balance = float(validator_stake)
-                    total_validator_alpha += validator_alpha_balance
-                    print(f"💰 {wallet.name} α on validator {validator_hotkey[:5]}...: {validator_alpha_balance:.6f} α")
-                except Exception as e:
-                    print(f"⚠️ Error getting {wallet.name} stake on validator {validator_hotkey[:5]}...: {e}")
+            for validator_hotkey, validator_stake in zip(VALIDATOR_HOTKEYS, validator_stakes):
+                if isinstance(validator_stake, Exception):
+                    lines.append(f"⚠️ Error getting {wallet.name} stake on validator {VALIDATOR_LABELS[validator_hotkey]}: {validator_stake}")
+                    continue
+                validator_alpha_balance = float(validator_stake)
+                total_validator_alpha += validator_alpha_balance
+                lines.append(f"💰 {wallet.name} α on validator {VALIDATOR_LABELS[validator_hotkey]}: {validator_alpha_balance:.6f} α")
             
-            print(f"💰 {wallet.name} total validator α: {total_validator_alpha:.6f} α")
+            lines.append(f"💰 {wallet.name} total validator α: {total_validator_alpha:.6f} α")
             alpha_balance += total_validator_alpha
             
             # Get TAO balance
-            balance = await sub.get_balance(coldkey_ss58)
+            if isinstance(balance, Exception):
+                raise balance
             tao_balance = float(balance)
         except Exception as e:
-            print(f"❌ Error retrieving balances: {e}")
+            lines.append(f"❌ Error retrieving balances: {e}")
+            print_lines(lines)
             return False, 0, False
         
         # Show current balances
-        print(f"   Current τ balance: {tao_balance:.6f} τ")
-        print(f"   Current α balance: {alpha_balance:.6f} α")
-        print(f"   τ reserve target: {DCA_RESERVE_TAO:.6f} τ")
-        print(f"   α reserve minimum: {DCA_RESERVE_ALPHA:.6f} α")
-        print(f"   Current α price: {alpha_price:.6f} τ")
+        lines.extend([
+            f"   Current τ balance: {tao_balance:.6f} τ",
+            f"   Current α balance: {alpha_balance:.6f} α",
+            f"   τ reserve target: {DCA_RESERVE_TAO:.6f} τ",
+            f"   α reserve minimum: {DCA_RESERVE_ALPHA:.6f} α",
+            f"   Current α price: {alpha_price:.6f} τ",
+        ])
         
         # Check if TAO balance is already sufficient
         if tao_balance >= DCA_RESERVE_TAO:
-            print(f"   ✅ TAO balance ({tao_balance:.6f} τ) is already above reserve target ({DCA_RESERVE_TAO:.6f} τ)")
+            lines.append(f"   ✅ TAO balance ({tao_balance:.6f} τ) is already above reserve target ({DCA_RESERVE_TAO:.6f} τ)")
+            print_lines(lines)
             return True, 0, True
         
         # Calculate how much TAO we need
         tao_deficit = DCA_RESERVE_TAO - tao_balance
-        print(f"   TAO deficit: {tao_deficit:.6f} τ")
+        lines.append(f"   TAO deficit: {tao_deficit:.6f} τ")
         
         # Check if we have enough alpha to unstake while maintaining minimum reserve
         available_alpha = alpha_balance - DCA_RESERVE_ALPHA
         if available_alpha <= 0:
-            print(f"   ⚠️ No excess α available for harvesting (current: {alpha_balance:.6f} α, minimum: {DCA_RESERVE_ALPHA:.6f} α)")
+            lines.append(f"   ⚠️ No excess α available for harvesting (current: {alpha_balance:.6f} α, minimum: {DCA_RESERVE_ALPHA:.6f} α)")
+            print_lines(lines)
             return False, tao_deficit, False
         
         # Calculate alpha needed to cover the deficit
@@ -969,74 +1575,95 @@ async def harvest_alpha_for_tao_reserve(sub, wallet, netuid, target_slippage, te
         
         # Limit to available alpha
         alpha_to_unstake = min(alpha_needed_estimate, available_alpha)
-        print(f"   Estimated α needed: {alpha_needed_estimate:.6f} α")
-        print(f"   Available α for unstaking: {available_alpha:.6f} α")
-        print(f"   Will attempt to unstake: {alpha_to_unstake:.6f} α")
+        lines.extend([
+            f"   Estimated α needed: {alpha_needed_estimate:.6f} α",
+            f"   Available α for unstaking: {available_alpha:.6f} α",
+            f"   Will attempt to unstake: {alpha_to_unstake:.6f} α",
+        ])
         
         # Determine optimal unstaking amount that respects slippage target
         # We'll use binary search to find the right amount of alpha to unstake
-        print(f"\n🔍 Finding optimal unstake amount with target slippage {target_slippage:.6f} τ...")
+        lines.append(f"\n🔍 Finding optimal unstake amount with target slippage {target_slippage:.6f} τ...")
         
-        min_alpha = 0.0
-        max_alpha = alpha_to_unstake
-        best_alpha = 0.0
-        closest_slippage = float('inf')
-        iterations = []
-        
-        while (max_alpha - min_alpha) > 1e-12:
-            current_alpha = (min_alpha + max_alpha) / 2
-            
-            # Get expected slippage for this alpha amount
-            tao_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=current_alpha)
-            slippage = float(tao_conversion[1].tao)
-            expected_tao = float(tao_conversion[0].tao)
-            
-            # Store iteration info
-            iterations.append((current_alpha, slippage, expected_tao))
-            
-            if abs(slippage - target_slippage) < abs(closest_slippage - target_slippage):
-                closest_slippage = slippage
-                best_alpha = current_alpha
-            
-            if abs(slippage - target_slippage) < 1e-12:  # Matching precision
-                break
-            elif slippage < target_slippage:
-                min_alpha = current_alpha
+        best_alpha = None
+        best_conversion = None  # (tao returned, slippage) in τ for best_alpha, when already computed
+        solved_alpha = solve_unstake_alpha(subnet_info, target_slippage)
+        if solved_alpha is not None:
+            if solved_alpha >= alpha_to_unstake:
+                best_alpha = alpha_to_unstake
             else:
-                max_alpha = current_alpha
+                # Verify the closed-form amount against the pool before trusting it
+                solved_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=solved_alpha)
+                solved_slippage = float(solved_conversion[1].tao)
+                if abs(solved_slippage - target_slippage) <= max(1e-7, target_slippage * 1e-3):
+                    best_alpha = solved_alpha
+                    best_conversion = (float(solved_conversion[0].tao), solved_slippage)
+            if best_alpha is not None:
+                lines.append(f"  • Solved {best_alpha:.6f} α for {target_slippage:.6f} τ target slippage")
+
+        if best_alpha is None:
+            # Fall back to searching the pool's slippage, comparing in integer rao
+            # Stop within SLIPPAGE_PRECISION, but never looser than the closed-form check above
+            tolerance_rao = int(min(SLIPPAGE_PRECISION, target_slippage * 1e-3) * 1e9)
+            conversion_at = unstake_conversion_rao(subnet_info)
+            # Probe the closed-form amount first when it only just missed verification
+            best_alpha_rao, _, probes = search_slippage(
+                lambda alpha_rao: conversion_at(alpha_rao)[1],
+                int(target_slippage * 1e9),
+                int(alpha_to_unstake * 1e9),
+                tolerance_rao,
+                seed=int(solved_alpha * 1e9) if solved_alpha is not None else None,
+            )
         
-        # Print first 3 and last 3 iterations
-        for i, (alpha, slip, tao) in enumerate(iterations):
-            if i < 3 or i >= len(iterations) - 3:
-                print(f"  • Testing {alpha:.6f} α → {slip:.6f} τ slippage, {tao:.6f} τ expected")
-            elif i == 3:
-                print("  • ...")
+            # Print first 3 and last 3 iterations
+            for probe in probes:
+                if probe is None:
+                    lines.append("  • ...")
+                    continue
+                alpha_rao, slip_rao = probe
+                tao_rao = conversion_at(alpha_rao)[0]
+                lines.append(f"  • Testing {alpha_rao / 1e9:.6f} α → {slip_rao / 1e9:.6f} τ slippage, {tao_rao / 1e9:.6f} τ expected")
+            best_alpha = best_alpha_rao / 1e9
+            tao_rao, slip_rao = conversion_at(best_alpha_rao)
+            best_conversion = (tao_rao / 1e9, slip_rao / 1e9)
         
         # Use the best alpha amount found
         alpha_amount = best_alpha
-        tao_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=alpha_amount)
-        total_tao_impact = float(tao_conversion[0].tao + tao_conversion[1].tao)
+        if best_conversion is None:
+            tao_conversion = subnet_info.alpha_to_tao_with_slippage(alpha=alpha_amount)
+            best_conversion = (float(tao_conversion[0].tao), float(tao_conversion[1].tao))
+        tao_returned, unstake_slippage = best_conversion
+        total_tao_impact = tao_returned + unstake_slippage
         
-        print(f"\n💫 Unstake Parameters")
-        print("-" * 40)
-        print(f"{'Amount to unstake':25}: {alpha_amount:.6f} α")
-        print(f"{'Expected TAO received':25}: {total_tao_impact:.6f} τ")
-        print(f"{'Slippage':25}: {float(tao_conversion[1].tao):.6f} τ")
-        print(f"{'New TAO balance (est)':25}: {(tao_balance + total_tao_impact):.6f} τ")
-        print(f"{'New alpha balance (est)':25}: {(alpha_balance - alpha_amount):.6f} α")
+        lines.extend([
+            f"\n💫 Unstake Parameters",
+            "-" * 40,
+            f"{'Amount to unstake':25}: {alpha_amount:.6f} α",
+            f"{'Expected TAO received':25}: {total_tao_impact:.6f} τ",
+            f"{'Slippage':25}: {unstake_slippage:.6f} τ",
+            f"{'New TAO balance (est)':25}: {(tao_balance + total_tao_impact):.6f} τ",
+            f"{'New alpha balance (est)':25}: {(alpha_balance - alpha_amount):.6f} α",
+        ])
         
         # Check if amount is below minimum unstake threshold
         if alpha_amount < MIN_UNSTAKE_ALPHA:
-            print(f"   ⚠️ Calculated unstake amount ({alpha_amount:.6f} α) is below minimum threshold ({MIN_UNSTAKE_ALPHA:.6f} α)")
-            print(f"   ⏭️ Skipping unstake operation to avoid transaction errors")
+            lines.extend([
+                f"   ⚠️ Calculated unstake amount ({alpha_amount:.6f} α) is below minimum threshold ({MIN_UNSTAKE_ALPHA:.6f} α)",
+                f"   ⏭️ Skipping unstake operation to avoid transaction errors",
+            ])
             
             # If the TAO deficit is very small, consider it "good enough" to avoid endless retries
             if tao_deficit < MIN_TAO_DEFICIT:  # If we're close enough to the target
-                print(f"   ✓ TAO deficit ({tao_deficit:.6f} τ) is below minimum threshold ({MIN_TAO_DEFICIT:.6f} τ), considering target achieved")
+                lines.append(f"   ✓ TAO deficit ({tao_deficit:.6f} τ) is below minimum threshold ({MIN_TAO_DEFICIT:.6f} τ), considering target achieved")
+                print_lines(lines)
                 return True, 0, False  # Mark as success with no deficit to prevent further attempts
             
+            print_lines(lines)
             return False, tao_deficit, (available_alpha > 0)
         
+        print_lines(lines)
+        lines = []
+        
         # Perform the unstake
         success = await perform_unstake(
             sub=sub,
@@ -1046,7 +1673,9 @@ async def harvest_alpha_for_tao_reserve(sub, wallet, netuid, target_slippage, te
             total_tao_impact=total_tao_impact,
             alpha_price=alpha_price,
             moving_price=moving_price,
-            test_mode=test_mode
+            subnet_info=subnet_info,
+            test_mode=test_mode,
+            slippage=unstake_slippage
         )
         
         if success:
@@ -1058,25 +1687,43 @@ async def harvest_alpha_for_tao_reserve(sub, wallet, netuid, target_slippage, te
             
             # Report on the results
             if remaining_deficit > 0:
-                print(f"\n🔷 Harvested {alpha_amount:.6f} α for {total_tao_impact:.6f} τ")
-                print(f"   Still need {remaining_deficit:.6f} τ to reach target")
+                lines.extend([
+                    f"\n🔷 Harvested {alpha_amount:.6f} α for {total_tao_impact:.6f} τ",
+                    f"   Still need {remaining_deficit:.6f} τ to reach target",
+                ])
                 if has_more_alpha:
-                    print(f"   This wallet has more α available for harvesting in next rotation")
+                    lines.append(f"   This wallet has more α available for harvesting in next rotation")
             else:
-                print(f"\n✅ Successfully harvested {alpha_amount:.6f} α for {total_tao_impact:.6f} τ")
-                print(f"   Target TAO reserve of {DCA_RESERVE_TAO:.6f} τ reached or exceeded")
+                lines.extend([
+                    f"\n✅ Successfully harvested {alpha_amount:.6f} α for {total_tao_impact:.6f} τ",
+                    f"   Target TAO reserve of {DCA_RESERVE_TAO:.6f} τ reached or exceeded",
+                ])
+            print_lines(lines)
             
             return True, remaining_deficit, has_more_alpha
         else:
             print(f"❌ Failed to unstake alpha")
             return False, tao_deficit, (available_alpha > 0)
     except Exception as e:
-        print(f"❌ Error during alpha harvesting: {e}")
+        lines.append(f"❌ Error during alpha harvesting: {e}")
+        print_lines(lines)
         import traceback
         traceback.print_exc()
         return False, 0, False
 
-async def rotate_wallets_for_harvest(netuid, unlocked_wallets):
+class HarvestWallet(NamedTuple):
+    """A wallet's balances as pre-fetched for a harvest rotation"""
+    wallet: Any
+    name: str
+    addresses: str
+    alpha_balance: float
+    tao_balance: float
+    available_alpha: float
+    tao_deficit: float
+    potential_tao: float
+    is_holding: bool
+
+async def rotate_wallets_for_harvest(netuid, unlocked_wallets, sub, block_watcher):
     """Rotate through all wallets and harvest alpha to maintain TAO reserve.
     
     This function:
@@ -1087,27 +1734,28 @@ async def rotate_wallets_for_harvest(netuid, unlocked_wallets):
     
     Note: Unlike the EMA chasing mode, alpha harvesting mode processes ALL wallets,
     including the holding wallet, since we want to maintain TAO reserves in all wallets.
+    
+    Runs on the caller's connection and block watcher, which outlive a single rotation.
     """
     # Include all wallets (including the holding wallet) for alpha harvesting
     wallets = unlocked_wallets
     
-    print(f"\n🔄 Starting alpha harvesting rotation for {len(wallets)} wallets...")
-    print(f"📊 Target: Maintain at least {DCA_RESERVE_TAO} τ and {DCA_RESERVE_ALPHA} α in each wallet")
-    print("=" * 60)
-    
-    # Track wallets that need another pass
-    wallets_needing_more_tao = []
+    print_lines([
+        f"\n🔄 Starting alpha harvesting rotation for {len(wallets)} wallets...",
+        f"📊 Target: Maintain at least {DCA_RESERVE_TAO} τ and {DCA_RESERVE_ALPHA} α in each wallet",
+        "=" * 60,
+    ])
     
-    async def get_subnet_info_with_retry(sub, max_retries=3):
-        """Helper function to get subnet info with retries"""
+    async def get_subnet_info_with_retry(sub, max_retries=3, full=False):
+        """Helper function to get subnet info with retries, reusing the cached subnet snapshot"""
         for attempt in range(max_retries):
             try:
-                subnet_info = await sub.subnet(netuid)
-                if subnet_info is None:
+                subnet_info, _ = await get_subnet_info(sub, netuid, full=full)
+                if subnet_info is not None:
+                    return subnet_info
+                if attempt < max_retries - 1:
                     print(f"⚠️ Subnet info is None, retrying... (attempt {attempt + 1}/{max_retries})")
                     await asyncio.sleep(BLOCK_TIME_SECONDS)
-                    continue
-                return subnet_info
             except Exception as e:
                 if attempt < max_retries - 1:
                     print(f"⚠️ Error getting subnet info: {e}")
@@ -1122,123 +1770,222 @@ async def rotate_wallets_for_harvest(netuid, unlocked_wallets):
         wallet_data = []
         
         print("\n📊 Pre-fetching wallet balances...")
-        async with bt.AsyncSubtensor(SUBTENSOR) as sub:
-            # Get subnet info for price information with retries
-            subnet_info = await get_subnet_info_with_retry(sub)
-            if subnet_info is None:
-                print("❌ Failed to get subnet info after retries")
-                print("⏳ Waiting before retry...")
-                await asyncio.sleep(BLOCK_TIME_SECONDS)
-                return
-                
-            alpha_price = float(subnet_info.price.tao)
+        # Get subnet info for price information with retries
+        subnet_info = await get_subnet_info_with_retry(sub)
+        if subnet_info is None:
+            print("❌ Failed to get subnet info after retries")
+            print("⏳ Waiting before retry...")
+            await asyncio.sleep(BLOCK_TIME_SECONDS)
+            return
             
-            for wallet in wallets:
-                try:
-                    # Get stake balance (alpha)
-                    current_stake = await sub.get_stake(
-                        coldkey_ss58=wallet.coldkeypub.ss58_address,
-                        hotkey_ss58=wallet.hotkey.ss58_address,
+        alpha_price = float(subnet_info.price.tao)
+        # Read every wallet at the same block so the comparison between them is consistent
+        block_hash = await sub.get_block_hash()
+        semaphore = asyncio.Semaphore(max(1, WALLET_CONCURRENCY))
+        
+        def needs_validator_stakes(current_stake, balance):
+            """Whether the validator stakes could change this wallet's harvest decision"""
+            if isinstance(current_stake, Exception) or isinstance(balance, Exception):
+                return True
+            tao_deficit = max(0, DCA_RESERVE_TAO - float(balance))
+            if tao_deficit == 0:
+                return False
+            # Keep a 25% margin for slippage before trusting the regular hotkey alone
+            alpha_needed = tao_deficit / max(alpha_price, 1e-12)
+            return float(current_stake) - DCA_RESERVE_ALPHA < alpha_needed * 1.25
+        
+        async def fetch_wallet(wallet):
+            """Fetch one wallet's stakes and balance, returning its row and its report lines"""
+            coldkey_ss58, hotkey_ss58 = get_wallet_addresses(wallet)
+            async with semaphore:
+                current_stake, balance = await asyncio.gather(
+                    rpc(sub.get_stake(
+                        coldkey_ss58=coldkey_ss58,
+                        hotkey_ss58=hotkey_ss58,
                         netuid=netuid,
-                    )
-                    alpha_balance = float(current_stake)
-                    print(f"💰 {wallet.name} has {alpha_balance:.6f} α")
-
-                    # Get stake balance on validator hotkeys
-                    total_validator_alpha = 0.0
-                    
-                    for validator_hotkey in VALIDATOR_HOTKEYS:
-                        try:
-                            validator_stake = await sub.get_stake(
-                                coldkey_ss58=wallet.coldkeypub.ss58_address,
+                        block_hash=block_hash,
+                    )),
+                    rpc(sub.get_balance(coldkey_ss58, block_hash=block_hash)),
+                    return_exceptions=True,
+                )
+                validator_stakes = None
+                if needs_validator_stakes(current_stake, balance):
+                    validator_stakes = await asyncio.gather(
+                        *(
+                            rpc(sub.get_stake(
+                                coldkey_ss58=coldkey_ss58,
                                 hotkey_ss58=validator_hotkey,
                                 netuid=netuid,
-                            )
-                            validator_alpha_balance = float(validator_stake)
-                            total_validator_alpha += validator_alpha_balance
-                            print(f"💰 {wallet.name} α on validator {validator_hotkey[:5]}...: {validator_alpha_balance:.6f} α")
-                        except Exception as e:
-                            print(f"⚠️ Error getting {wallet.name} stake on validator {validator_hotkey[:5]}...: {e}")
-                            continue  # Skip this validator but continue with others
-                    
-                    print(f"💰 {wallet.name} total validator α: {total_validator_alpha:.6f} α")
-                    alpha_balance += total_validator_alpha
-                    
-                    # Calculate available alpha (excess above reserve)
-                    available_alpha = max(0, alpha_balance - DCA_RESERVE_ALPHA)
-                    
-                    # Get TAO balance
-                    balance = await sub.get_balance(wallet.coldkeypub.ss58_address)
-                    tao_balance = float(balance)
-                    print(f"💰 {wallet.name} has {tao_balance:.6f} τ")
-                    # Calculate TAO deficit
-                    tao_deficit = max(0, DCA_RESERVE_TAO - tao_balance)
-                    
-                    # Add wallet data
-                    cold_addr = wallet.coldkeypub.ss58_address[:5] + "..."
-                    hot_addr = wallet.hotkey.ss58_address[:5] + "..."
-                    
-                    # Add a flag to identify the holding wallet
-                    is_holding = wallet.name == HOLDING_WALLET_NAME
-                    
-                    wallet_data.append({
-                        'wallet': wallet,
-                        'name': wallet.name + (" (Holding)" if is_holding else ""),
-                        'addresses': f"cold({cold_addr}) hot({hot_addr})",
-                        'alpha_balance': alpha_balance,
-                        'tao_balance': tao_balance,
-                        'available_alpha': available_alpha,
-                        'tao_deficit': tao_deficit,
-                        'potential_tao': available_alpha * alpha_price,  # Rough estimate of potential TAO
-                        'is_holding': is_holding
-                    })
-                    
-                except Exception as e:
-                    print(f"❌ Error fetching balances for wallet {wallet.name}: {e}")
-                    continue  # Skip this wallet but continue with others
+                                block_hash=block_hash,
+                            ))
+                            for validator_hotkey in VALIDATOR_HOTKEYS
+                        ),
+                        return_exceptions=True,
+                    )
+            return wallet_row(wallet, current_stake, balance, validator_stakes)
         
+        def wallet_row(wallet, current_stake, balance, validator_stakes):
+            """Build one wallet's row and its report lines from its reads"""
+            # Get stake balance (alpha)
+            if isinstance(current_stake, Exception):
+                raise current_stake
+            alpha_balance = float(current_stake)
+            lines = [f"💰 {wallet.name} has {alpha_balance:.6f} α"]
+
+            # Get stake balance on validator hotkeys
+            total_validator_alpha = 0.0
+            
+            if validator_stakes is None:
+                lines.append(f"💰 {wallet.name} regular hotkey α covers any TAO deficit, validator stakes not read")
+            else:
+                for validator_hotkey, validator_stake in zip(VALIDATOR_HOTKEYS, validator_stakes):
+                    if isinstance(validator_stake, Exception):
+                        # Skip this validator but continue with others
+                        lines.append(f"⚠️ Error getting {wallet.name} stake on validator {VALIDATOR_LABELS[validator_hotkey]}: {validator_stake}")
+                        continue
+                    validator_alpha_balance = float(validator_stake)
+                    total_validator_alpha += validator_alpha_balance
+                    lines.append(f"💰 {wallet.name} α on validator {VALIDATOR_LABELS[validator_hotkey]}: {validator_alpha_balance:.6f} α")
+                
+                lines.append(f"💰 {wallet.name} total validator α: {total_validator_alpha:.6f} α")
+            alpha_balance += total_validator_alpha
+            
+            # Calculate available alpha (excess above reserve)
+            available_alpha = max(0, alpha_balance - DCA_RESERVE_ALPHA)
+            
+            # Get TAO balance
+            if isinstance(balance, Exception):
+                raise balance
+            tao_balance = float(balance)
+            lines.append(f"💰 {wallet.name} has {tao_balance:.6f} τ")
+            # Calculate TAO deficit
+            tao_deficit = max(0, DCA_RESERVE_TAO - tao_balance)
+            
+            # Add a flag to identify the holding wallet
+            is_holding = wallet.name == HOLDING_WALLET_NAME
+            
+            return HarvestWallet(
+                wallet=wallet,
+                name=wallet.name + (" (Holding)" if is_holding else ""),
+                addresses=get_wallet_label(wallet),
+                alpha_balance=alpha_balance,
+                tao_balance=tao_balance,
+                available_alpha=available_alpha,
+                tao_deficit=tao_deficit,
+                potential_tao=available_alpha * alpha_price,  # Rough estimate of potential TAO
+                is_holding=is_holding,
+            ), lines
+        
+        try:
+            # Every regular stake and balance in one storage request
+            addresses = [get_wallet_addresses(wallet) for wallet in wallets]
+            stakes, balances = await query_stakes_and_balances(
+                bt,
+                sub,
+                netuid,
+                addresses,
+                list(dict.fromkeys(coldkey_ss58 for coldkey_ss58, _ in addresses)),
+                block_hash,
+            )
+            # Then the validator stakes, only for wallets near the reserve threshold
+            scan_coldkeys = [
+                coldkey_ss58 for coldkey_ss58, hotkey_ss58 in addresses
+                if needs_validator_stakes(stakes[(coldkey_ss58, hotkey_ss58)], balances[coldkey_ss58])
+            ]
+            if scan_coldkeys:
+                validator_stakes, _ = await query_stakes_and_balances(
+                    bt,
+                    sub,
+                    netuid,
+                    [
+                        (coldkey_ss58, validator_hotkey)
+                        for coldkey_ss58 in scan_coldkeys
+                        for validator_hotkey in VALIDATOR_HOTKEYS
+                    ],
+                    [],
+                    block_hash,
+                )
+                stakes.update(validator_stakes)
+            scan_coldkeys = set(scan_coldkeys)
+            results = []
+            for wallet, (coldkey_ss58, hotkey_ss58) in zip(wallets, addresses):
+                try:
+                    results.append(wallet_row(
+                        wallet,
+                        stakes[(coldkey_ss58, hotkey_ss58)],
+                        balances[coldkey_ss58],
+                        [stakes[(coldkey_ss58, validator_hotkey)] for validator_hotkey in VALIDATOR_HOTKEYS]
+                        if coldkey_ss58 in scan_coldkeys else None,
+                    ))
+                except Exception as e:
+                    results.append(e)
+        except Exception as e:
+            print(f"⚠️ Batched balance read failed ({e}), reading wallets individually...")
+            results = await asyncio.gather(*(fetch_wallet(wallet) for wallet in wallets), return_exceptions=True)
+        # Report in wallet order once everything is in, skipping wallets that failed
+        for wallet, result in zip(wallets, results):
+            if isinstance(result, Exception):
+                print(f"❌ Error fetching balances for wallet {wallet.name}: {result}")
+                continue
+            row, lines = result
+            print_lines(lines)
+            wallet_data.append(row)
+    
         if not wallet_data:
             print("❌ No wallet data could be fetched")
             print("⏳ Waiting before retry...")
             await asyncio.sleep(BLOCK_TIME_SECONDS)
             return
             
-        # Filter wallets that need TAO
-        needy_wallets = [w for w in wallet_data if w['tao_deficit'] > 0]
-        
-        # Sort by available alpha (highest first)
-        needy_wallets.sort(key=lambda w: w['available_alpha'], reverse=True)
+        # Filter wallets that need TAO, sorted by available alpha (highest first)
+        needy_wallets = sorted(
+            (w for w in wallet_data if w.tao_deficit > 0),
+            key=attrgetter('available_alpha'),
+            reverse=True,
+        )
         
         print(f"\n📝 Found {len(needy_wallets)} of {len(wallets)} wallets below TAO reserve")
         
         # Print summary of wallets sorted by available alpha
         if needy_wallets:
-            print("\n🔄 Wallets to process (sorted by available alpha):")
-            print("-" * 85)
-            print(f"{'#':3} {'Wallet':20} {'Addresses':25} {'α Balance':12} {'τ Balance':12} {'τ Deficit':12}")
-            print("-" * 85)
-            
-            for i, w in enumerate(needy_wallets):
-                print(f"{i+1:3} {w['name']:20} {w['addresses']:25} {w['alpha_balance']:12.6f} {w['tao_balance']:12.6f} {w['tao_deficit']:12.6f}")
-            
-            print("-" * 85)
+            print_lines([
+                "\n🔄 Wallets to process (sorted by available alpha):",
+                "-" * 85,
+                f"{'#':3} {'Wallet':20} {'Addresses':25} {'α Balance':12} {'τ Balance':12} {'τ Deficit':12}",
+                "-" * 85,
+                *(
+                    f"{i+1:3} {w.name:20} {w.addresses:25} {w.alpha_balance:12.6f} {w.tao_balance:12.6f} {w.tao_deficit:12.6f}"
+                    for i, w in enumerate(needy_wallets)
+                ),
+                "-" * 85,
+            ])
         else:
             print("✅ All wallets have sufficient TAO reserves")
             return
         
-        # Process wallets that need TAO in order of available alpha
-        async with bt.AsyncSubtensor(SUBTENSOR) as sub:
-            for i, wallet_info in enumerate(needy_wallets):
-                wallet = wallet_info['wallet']
-                
-                print(f"\n[{i+1}/{len(needy_wallets)}] 🔄 Processing wallet: {wallet_info['name']}")
-                print(f"   Current α: {wallet_info['alpha_balance']:.6f}, τ: {wallet_info['tao_balance']:.6f}, Deficit: {wallet_info['tao_deficit']:.6f} τ")
-                
-                # Skip wallets with no available alpha
-                if wallet_info['available_alpha'] <= 0:
-                    print(f"   ⏭️ Skipping wallet with no available alpha")
-                    continue
-                
+        # Harvests take turns so each sizes its unstake against the pool the previous one left behind,
+        # but a wallet's wait for the next block no longer holds up the wallets after it
+        trade_lock = asyncio.Lock()
+        
+        async def first_pass(i, wallet_info):
+            """Harvest one needy wallet, returning whether it should get a second pass"""
+            wallet = wallet_info.wallet
+            
+            # Skip wallets with no available alpha
+            if wallet_info.available_alpha <= 0:
+                print_lines([
+                    f"\n[{i+1}/{len(needy_wallets)}] 🔄 Processing wallet: {wallet_info.name}",
+                    f"   ⏭️ Skipping wallet with no available alpha",
+                ])
+                return False
+            
+            async with trade_lock:
+                print_lines([
+                    f"\n[{i+1}/{len(needy_wallets)}] 🔄 Processing wallet: {wallet_info.name}",
+                    f"   Current α: {wallet_info.alpha_balance:.6f}, τ: {wallet_info.tao_balance:.6f}, Deficit: {wallet_info.tao_deficit:.6f} τ",
+                ])
+                # A block that lands while the harvest is still running counts toward the wait below
+                seen_block = block_watcher.block_number
                 success, remaining_deficit, has_more_alpha = await harvest_alpha_for_tao_reserve(
                     sub=sub, 
                     wallet=wallet, 
@@ -1249,40 +1996,62 @@ async def rotate_wallets_for_harvest(netuid, unlocked_wallets):
                 
                 # If the wallet still needs TAO and has more alpha to unstake,
                 # add it to the list for another pass
-                if success and remaining_deficit > 0 and has_more_alpha:
-                    print(f"   📝 Adding wallet {wallet_info['name']} to queue for another pass (deficit: {remaining_deficit:.6f} τ)")
-                    wallets_needing_more_tao.append(wallet)
-                
-                print("⏳ Waiting before next wallet...")
-                await sub.wait_for_block()
+                needs_more = success and remaining_deficit > 0 and has_more_alpha
+                if needs_more:
+                    print(f"   📝 Adding wallet {wallet_info.name} to queue for another pass (deficit: {remaining_deficit:.6f} τ)")
             
-            # If we have wallets needing another pass, process them
-            if wallets_needing_more_tao:
-                print(f"\n🔄 Starting second pass for {len(wallets_needing_more_tao)} wallets that need more TAO...")
+            await block_watcher.wait_for_block(seen_block)
+            return needs_more
+        
+        async def second_pass(i, wallet):
+            """Give a wallet that still needs TAO another harvest"""
+            wallet_name = wallet.name
+            if wallet_name == HOLDING_WALLET_NAME:
+                wallet_name += " (Holding)"
+            
+            async with trade_lock:
+                print(f"\n[{i+1}/{len(wallets_needing_more_tao)}] 🔄 Second pass for wallet: {wallet_name}")
                 
-                for i, wallet in enumerate(wallets_needing_more_tao):
-                    wallet_name = wallet.name
-                    if wallet_name == HOLDING_WALLET_NAME:
-                        wallet_name += " (Holding)"
-                        
-                    print(f"\n[{i+1}/{len(wallets_needing_more_tao)}] 🔄 Second pass for wallet: {wallet_name}")
-                    
-                    # Get fresh subnet info for second pass
-                    subnet_info = await get_subnet_info_with_retry(sub)
-                    if subnet_info is None:
-                        print("❌ Failed to get subnet info for second pass")
-                        continue
-                    
-                    await harvest_alpha_for_tao_reserve(
-                        sub=sub, 
-                        wallet=wallet, 
-                        netuid=netuid, 
-                        target_slippage=args.slippage, 
-                        test_mode=TEST_MODE
-                    )
-                    
-                    print("⏳ Waiting before next wallet...")
-                    await sub.wait_for_block()
+                # Get fresh subnet info for second pass, with the reserves the harvest sizes against
+                seen_block = block_watcher.block_number
+                subnet_info = await get_subnet_info_with_retry(sub, full=True)
+                if subnet_info is None:
+                    print("❌ Failed to get subnet info for second pass")
+                    return
+                
+                await harvest_alpha_for_tao_reserve(
+                    sub=sub, 
+                    wallet=wallet, 
+                    netuid=netuid, 
+                    target_slippage=args.slippage, 
+                    test_mode=TEST_MODE,
+                    subnet_info=subnet_info
+                )
+            
+            await block_watcher.wait_for_block(seen_block)
+        
+        # Process wallets that need TAO in order of available alpha; the lock hands out turns in that order
+        needs_more = await asyncio.gather(
+            *(first_pass(i, wallet_info) for i, wallet_info in enumerate(needy_wallets)),
+            return_exceptions=True,
+        )
+        wallets_needing_more_tao = []
+        for wallet_info, more in zip(needy_wallets, needs_more):
+            if isinstance(more, Exception):
+                print(f"❌ Error harvesting wallet {wallet_info.name}: {more}")
+            elif more:
+                wallets_needing_more_tao.append(wallet_info.wallet)
+        
+        # If we have wallets needing another pass, process them
+        if wallets_needing_more_tao:
+            print(f"\n🔄 Starting second pass for {len(wallets_needing_more_tao)} wallets that need more TAO...")
+            results = await asyncio.gather(
+                *(second_pass(i, wallet) for i, wallet in enumerate(wallets_needing_more_tao)),
+                return_exceptions=True,
+            )
+            for wallet, result in zip(wallets_needing_more_tao, results):
+                if isinstance(result, Exception):
+                    print(f"❌ Error in second pass for wallet {wallet.name}: {result}")
                 
     except Exception as e:
         print(f"❌ Error in wallet rotation: {e}")
@@ -1331,7 +2100,7 @@ if __name__ == "__main__":
     if args.rotate_all_wallets:
         # Rotate all wallets mode - initialize_wallets will handle all wallets
         all_wallets = initialize_wallets(bt)
-        asyncio.run(main(wallets=all_wallets))
+        run = main(wallets=all_wallets)
     else:
         # Single wallet mode (with or without specific hotkey)
         wallet_name = args.wallet
@@ -1340,16 +2109,15 @@ if __name__ == "__main__":
         if args.harvest_alpha and wallet_name and not hotkey_name:
             # If harvesting alpha with only wallet specified, initialize all hotkeys for that wallet
             wallet_hotkeys = initialize_wallets(bt, wallet_name=wallet_name)
-            asyncio.run(main(wallets=wallet_hotkeys))
+            run = main(wallets=wallet_hotkeys)
         else:
             # For single wallet+hotkey, just initialize and continue normally
             single_wallet = initialize_wallet(bt, wallet_name, hotkey_name)
-            asyncio.run(main(single_wallet=single_wallet))
+            run = main(single_wallet=single_wallet)
 
-    def signal_handler(signum, frame):
-        print("\n⚠️ Received termination signal. Cleaning up...")
-        # Close any open connections
-        sys.exit(0)
-
-    signal.signal(signal.SIGTERM, signal_handler)
-    signal.signal(signal.SIGINT, signal_handler)
\ No newline at end of file
+    try:
+        event_loop.run(run)
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        pass  # Shutdown requested; main() has already cleaned up its connection
+    finally:
+        db.close()
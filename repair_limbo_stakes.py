@@ -1,18 +1,18 @@
-import asyncio
-from typing import List
+from __future__ import annotations
 
-import bittensor as bt
-from bittensor.core.async_subtensor import AsyncSubtensor, StakeInfo
-from bittensor.utils.balance import Balance
-from bittensor.utils.btlogging import logging
-from bittensor_wallet import Wallet
+from typing import List, TYPE_CHECKING
+
+# bittensor is imported lazily in main() after argument parsing so --help stays fast
+if TYPE_CHECKING:
+    from bittensor.core.async_subtensor import AsyncSubtensor, StakeInfo
 
 from utils.password_manager import WalletPasswordManager
+from utils import event_loop
+from utils.subtensor import create_async_subtensor
 from btt_subnet_dca import initialize_wallets
 from utils.settings import (
-    SUBTENSOR, 
     NETUID,
-    VALIDATOR_HOTKEYS,
+    VALIDATOR_HOTKEY,
     HOLDING_WALLET_NAME,
     HOLDING_WALLET_ADDRESS,
 )
@@ -20,13 +20,6 @@ from utils.settings import (
 # Import the delegate function from the original script
 from btt_miner_stake_for_dividends import delegate_stake_to_vali
 
-logging.on()
-logging.set_debug(True)
-
-# Extract the first validator hotkey
-VALIDATOR_HOTKEY = VALIDATOR_HOTKEYS[0]
-
-
 async def find_limbo_stakes(subtensor: AsyncSubtensor) -> List[StakeInfo]:
     """
     Find all stakes in the holding wallet that are NOT on the validator hotkey.
@@ -59,7 +52,6 @@ async def repair_limbo_stakes():
     
     # Initialize password manager
     password_manager = WalletPasswordManager()
-    password_manager.load_env()
     
     # Initialize holding wallet
     print(f"🔐 Initializing holding wallet: {HOLDING_WALLET_NAME}")
@@ -71,7 +63,7 @@ async def repair_limbo_stakes():
     hodl_wallet = hodl_wallets[0]
     print(f"✅ Holding wallet initialized: {hodl_wallet.coldkeypub.ss58_address[:8]}...")
     
-    async with bt.AsyncSubtensor(SUBTENSOR) as subtensor:
+    async with create_async_subtensor(bt) as subtensor:
         
         # Find all limbo stakes
         limbo_stakes = await find_limbo_stakes(subtensor)
@@ -110,7 +102,7 @@ async def repair_limbo_stakes():
                     
             except Exception as e:
                 print(f"   ❌ Error: {str(e)}")
-                logging.error(f"Failed to delegate stake from {stake.hotkey_ss58}: {e}")
+                bt.logging.error(f"Failed to delegate stake from {stake.hotkey_ss58}: {e}")
         
         # Summary
         print(f"\n📊 Repair Summary:")
@@ -137,7 +129,7 @@ async def show_current_state():
     print(f"\n📊 Current State of Holding Wallet Stakes")
     print("=" * 60)
     
-    async with bt.AsyncSubtensor(SUBTENSOR) as subtensor:
+    async with create_async_subtensor(bt) as subtensor:
         stakes = await subtensor.get_stake_for_coldkey(HOLDING_WALLET_ADDRESS)
         
         # Group by hotkey
@@ -185,13 +177,20 @@ def main():
                         help='Show current state without making changes')
     
     args = parser.parse_args()
+
+    # Import bittensor after argument parsing to avoid its startup cost for --help
+    global bt
+    import bittensor as bt
+
+    bt.logging.on()
+    bt.logging.set_debug(True)
     
     if args.show_state:
-        asyncio.run(show_current_state())
+        event_loop.run(show_current_state())
     else:
         print("🔧 Starting limbo stake repair process...")
         print("This will delegate all non-validator stakes to the validator hotkey")
-        asyncio.run(repair_limbo_stakes())
+        event_loop.run(repair_limbo_stakes())
 
 
 if __name__ == "__main__":
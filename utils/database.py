@@ -7,6 +7,11 @@ class SubnetDCADatabase:
         """Initialize database connection and create tables if they don't exist"""
         self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
+        # WAL only syncs at checkpoints with synchronous=NORMAL, so a trade's inserts don't each wait on
+        # an fsync, and reports can read while the bot writes
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.wallet_ids = {}  # (coldkey, hotkey) -> wallets.id
         self.create_tables()
 
     def create_tables(self):
@@ -57,6 +62,10 @@ class SubnetDCADatabase:
 
     def get_or_create_wallet(self, coldkey: str, hotkey: str) -> int:
         """Get wallet ID or create if not exists"""
+        wallet_id = self.wallet_ids.get((coldkey, hotkey))
+        if wallet_id is not None:
+            return wallet_id
+
         with self.conn:
             # First try to get existing wallet
             cursor = self.conn.execute(
@@ -66,6 +75,7 @@ class SubnetDCADatabase:
             result = cursor.fetchone()
             
             if result:
+                self.wallet_ids[(coldkey, hotkey)] = result[0]
                 return result[0]
             
             # If not found, create new wallet and return its ID
@@ -74,6 +84,7 @@ class SubnetDCADatabase:
                 (coldkey, hotkey)
             )
             self.conn.commit()  # Make sure the insert is committed
+            self.wallet_ids[(coldkey, hotkey)] = cursor.lastrowid
             return cursor.lastrowid
 
         # If we somehow got here without a valid ID, raise an error
@@ -0,0 +1,16 @@
+import asyncio
+
+
+def run(coro):
+    """Run a coroutine to completion, on uvloop when it is installed.
+
+    The bot spends its time waiting on websocket round trips, where uvloop's
+    lower per-await overhead helps; the stock asyncio loop is used otherwise.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
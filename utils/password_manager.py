@@ -67,8 +67,8 @@ class WalletPasswordManager:
         # Write back to file
         self.env_file.write_text("\n".join(lines) + "\n")
         
-        # Reload environment
-        load_dotenv(self.env_path)
+        # Update the environment directly instead of re-parsing the whole file
+        os.environ[env_key] = password
     
     def clear_password(self, wallet_name: str):
         """Remove password from .env file"""
@@ -80,5 +80,5 @@ class WalletPasswordManager:
                     if not line.startswith(f"{env_key}=")]
             self.env_file.write_text("\n".join(lines) + "\n")
             
-        # Reload environment
-        load_dotenv(self.env_path) 
\ No newline at end of file
+        # Drop it from the environment too; reloading the file would leave the old value set
+        os.environ.pop(env_key, None) 
\ No newline at end of file
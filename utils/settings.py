@@ -6,8 +6,20 @@ load_dotenv()
 
 # Network settings
 SUBTENSOR = os.getenv('SUBTENSOR', 'finney')
+
+# Comma-separated endpoints to fail over to when SUBTENSOR is unavailable
+SUBTENSOR_FALLBACK_ENDPOINTS = [e.strip() for e in os.getenv('SUBTENSOR_FALLBACK_ENDPOINTS', '').split(',') if e.strip()]
 BLOCK_TIME_SECONDS = int(os.getenv('BLOCK_TIME_SECONDS', '12'))
 
+# Maximum age in blocks of a cached subnet snapshot before it is fully re-fetched
+SUBNET_INFO_REFRESH_BLOCKS = int(os.getenv('SUBNET_INFO_REFRESH_BLOCKS', '10'))
+
+# Maximum number of wallets processed concurrently in --rotate-all-wallets mode (trades still go one at a time)
+WALLET_CONCURRENCY = int(os.getenv('WALLET_CONCURRENCY', '8'))
+
+# Maximum number of stake, balance and subnet reads in flight at once on the Subtensor connection
+RPC_CONCURRENCY = int(os.getenv('RPC_CONCURRENCY', '16'))
+
 # Subnet settings
 NETUID = int(os.getenv('NETUID', '0'))
 
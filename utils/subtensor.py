@@ -0,0 +1,225 @@
+import asyncio
+import time
+
+from utils.settings import SUBTENSOR, SUBTENSOR_FALLBACK_ENDPOINTS
+
+
+def create_async_subtensor(bt):
+    """Create an AsyncSubtensor for SUBTENSOR that fails over to SUBTENSOR_FALLBACK_ENDPOINTS.
+
+    With fallbacks configured the substrate connection moves to the next endpoint after a
+    sustained failure and cycles back to SUBTENSOR, so a bad endpoint doesn't stall the bot.
+
+    Args:
+        bt: The bittensor module
+    """
+    if SUBTENSOR_FALLBACK_ENDPOINTS:
+        return bt.AsyncSubtensor(SUBTENSOR, fallback_endpoints=SUBTENSOR_FALLBACK_ENDPOINTS, retry_forever=True)
+    return bt.AsyncSubtensor(SUBTENSOR)
+
+
+async def check_subtensor_health(subtensor) -> bool:
+    """Ping the chain head to confirm the connection is alive (and let failover kick in if it isn't)"""
+    try:
+        await subtensor.get_current_block()
+        return True
+    except Exception as e:
+        print(f"⚠️ Subtensor health check failed: {e}")
+        return False
+
+
+async def close_subtensor(subtensor):
+    """Close a subtensor connection, ignoring errors from an already broken socket"""
+    try:
+        await subtensor.close()
+    except Exception:
+        pass
+
+
+async def ensure_subtensor(bt, subtensor=None, accounts=()):
+    """Return subtensor if it is still healthy, otherwise close it and open a fresh connection.
+
+    Args:
+        bt: The bittensor module
+        subtensor: The current connection, or None to open a new one
+        accounts: Coldkey ss58 addresses whose cached nonces are dropped on reconnect
+    """
+    if subtensor is not None:
+        if await check_subtensor_health(subtensor):
+            return subtensor
+        await close_subtensor(subtensor)
+
+    subtensor = create_async_subtensor(bt)
+    await subtensor.initialize()
+    # Trades after a reconnect start from the chain's next index, never a count carried over
+    for coldkey_ss58 in accounts:
+        reset_account_nonce(subtensor, coldkey_ss58)
+    return subtensor
+
+
+def reset_account_nonce(subtensor, coldkey_ss58):
+    """Drop the cached nonce for coldkey_ss58 so its next extrinsic re-reads account_nextIndex.
+
+    The substrate client hands out nonces from a per-account cache that only counts up, so on a
+    long-lived connection one rejected extrinsic would leave every later one with a future nonce.
+    """
+    # async-substrate-interface 1.x has no public way to clear it, so drop the entry from the cache itself
+    nonces = getattr(subtensor.substrate, "_nonces", None)
+    if nonces is not None:
+        nonces.pop(coldkey_ss58, None)
+
+
+async def submit_extrinsic(subtensor, coldkey_ss58, extrinsic):
+    """Await a stake extrinsic call, resetting coldkey_ss58's cached nonce if it fails or raises"""
+    try:
+        result = await extrinsic
+    except Exception:
+        reset_account_nonce(subtensor, coldkey_ss58)
+        raise
+    if not result:
+        reset_account_nonce(subtensor, coldkey_ss58)
+    return result
+
+
+def _fixed_to_float(fixed) -> float:
+    """Convert a decoded U64F64 storage value to float the way bittensor's fixed_to_float does"""
+    bits = fixed["bits"] if fixed else 0
+    return (bits >> 64) + (bits & (2**64 - 1)) / 2**64
+
+
+async def query_stakes_and_balances(bt, subtensor, netuid, stake_pairs, coldkeys, block_hash=None):
+    """Read several stakes and balances in a single state_queryStorageAt request.
+
+    Computes the same values as AsyncSubtensor.get_stake and get_balance, which spend three
+    storage reads per stake and one per balance, each in its own round trip.
+
+    Args:
+        bt: The bittensor module
+        subtensor: An initialized AsyncSubtensor
+        netuid: Subnet the stakes are on
+        stake_pairs: (coldkey ss58, hotkey ss58) pairs to read the stake of
+        coldkeys: Coldkey ss58 addresses to read the free balance of
+        block_hash: Block to read at, or None for the chain head
+
+    Returns:
+        tuple: ({(coldkey, hotkey): alpha Balance}, {coldkey: TAO Balance})
+    """
+    substrate = subtensor.substrate
+    hotkeys = list(dict.fromkeys(hotkey for _, hotkey in stake_pairs))
+
+    async def storage_key(module, storage_function, params):
+        return await substrate.create_storage_key(module, storage_function, params, block_hash=block_hash)
+
+    alpha_keys = [await storage_key("SubtensorModule", "Alpha", [hotkey, coldkey, netuid]) for coldkey, hotkey in stake_pairs]
+    hotkey_alpha_keys = [await storage_key("SubtensorModule", "TotalHotkeyAlpha", [hotkey, netuid]) for hotkey in hotkeys]
+    hotkey_share_keys = [await storage_key("SubtensorModule", "TotalHotkeyShares", [hotkey, netuid]) for hotkey in hotkeys]
+    account_keys = [await storage_key("System", "Account", [coldkey]) for coldkey in coldkeys]
+
+    results = await substrate.query_multi(
+        alpha_keys + hotkey_alpha_keys + hotkey_share_keys + account_keys, block_hash=block_hash
+    )
+    values = {key.to_hex(): value for key, value in results}
+
+    hotkey_totals = {
+        hotkey: (values.get(alpha_key.to_hex()) or 0, _fixed_to_float(values.get(shares_key.to_hex())))
+        for hotkey, alpha_key, shares_key in zip(hotkeys, hotkey_alpha_keys, hotkey_share_keys)
+    }
+    stakes = {}
+    for (coldkey, hotkey), alpha_key in zip(stake_pairs, alpha_keys):
+        hotkey_alpha, hotkey_shares = hotkey_totals[hotkey]
+        if hotkey_shares == 0:
+            stake = 0
+        else:
+            stake = _fixed_to_float(values.get(alpha_key.to_hex())) / hotkey_shares * hotkey_alpha
+        stakes[(coldkey, hotkey)] = bt.Balance.from_rao(int(stake)).set_unit(netuid=netuid)
+
+    balances = {}
+    for coldkey, account_key in zip(coldkeys, account_keys):
+        account = values.get(account_key.to_hex()) or {"data": {"free": 0}}
+        balances[coldkey] = bt.Balance(account["data"]["free"])
+
+    return stakes, balances
+
+
+class BlockWatcher:
+    """Push-based block clock backed by one chain_subscribeNewHeads subscription.
+
+    AsyncSubtensor.wait_for_block() fetches the head and opens a fresh subscription on
+    every call; this keeps a single subscription open for the life of the connection.
+    """
+
+    def __init__(self, subtensor):
+        self.subtensor = subtensor
+        self.block_number = None
+        self.last_block_time = None
+        self._new_block = asyncio.Condition()
+        self._task = None
+
+    def start(self):
+        """Start the header subscription in the background, restarting it if it has stopped"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._subscribe())
+            self._task.add_done_callback(self._on_subscription_done)
+
+    def _on_subscription_done(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️ Block subscription stopped, falling back to polling: {task.exception()}")
+        # Waiters parked on the condition would otherwise wait forever for a feed that has ended
+        asyncio.ensure_future(self._wake_waiters())
+
+    async def _wake_waiters(self):
+        async with self._new_block:
+            self._new_block.notify_all()
+
+    def _subscription_running(self):
+        return self._task is not None and not self._task.done()
+
+    async def _subscribe(self):
+        async def handler(block_data: dict):
+            async with self._new_block:
+                self.block_number = block_data["header"]["number"]
+                self.last_block_time = time.monotonic()
+                self._new_block.notify_all()
+            return None  # Returning None keeps the subscription open
+
+        await self.subtensor.substrate.subscribe_block_headers(handler)
+
+    async def wait_for_block(self, after=None):
+        """Wait for a block newer than after (default: the next block), falling back to polling if the subscription isn't running.
+
+        Passing the block a caller last acted on returns at once when a newer one already arrived while it was busy.
+        """
+        if not self._subscription_running():
+            return await self._poll_for_block()
+
+        async with self._new_block:
+            last = self.block_number if after is None else after
+
+            def arrived():
+                return self.block_number is not None and (last is None or self.block_number > last)
+
+            # Also wake if the subscription ends mid-wait, then finish the wait by polling
+            await self._new_block.wait_for(lambda: arrived() or not self._subscription_running())
+            if arrived():
+                return True
+        return await self._poll_for_block()
+
+    async def _poll_for_block(self):
+        """Wait one block by polling, resubscribing first if the feed ended on its own rather than through stop()"""
+        if self._task is not None:
+            self.start()
+        return await self.subtensor.wait_for_block()
+
+    def is_live(self, max_age):
+        """Whether the subscription is running and delivered a block within the last max_age seconds"""
+        return (
+            self._subscription_running()
+            and self.last_block_time is not None
+            and time.monotonic() - self.last_block_time < max_age
+        )
+
+    def stop(self):
+        """Cancel the header subscription"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None